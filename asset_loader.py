@@ -0,0 +1,88 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from config import *
+
+
+def warm_texture(path):
+    """Decode an image into Panda3D's texture pool so entities find it cached"""
+    from panda3d.core import Filename, TexturePool
+
+    return TexturePool.load_texture(Filename.from_os_specific(os.path.abspath(path)))
+
+
+def warm_sound(path):
+    """Decode a sound into the audio manager's cache"""
+    from direct.showbase import ShowBaseGlobal
+    from panda3d.core import Filename
+
+    return ShowBaseGlobal.base.loader.loadSfx(
+        Filename.from_os_specific(os.path.abspath(path))
+    )
+
+
+class AssetLoader:
+    def __init__(self, workers=ASSET_LOADER_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = {}
+        self.lazy = {}
+        self.timings = {}
+        self.started = time.perf_counter()
+        self.startup_time = None
+
+    def timed(self, key, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[key] = time.perf_counter() - start
+
+    def load(self, key, func, *args):
+        """Start loading an asset on the thread pool"""
+        if key not in self.futures:
+            self.futures[key] = self.executor.submit(self.timed, key, func, *args)
+        return self.futures[key]
+
+    def register(self, key, func, *args):
+        """Declare an asset that is only loaded on first use or prefetch"""
+        self.lazy[key] = (func, args)
+
+    def prefetch(self, key):
+        """Start loading a lazy asset now because it will be needed soon"""
+        if key in self.futures:
+            return self.futures[key]
+        if key in self.lazy:
+            func, args = self.lazy[key]
+            return self.load(key, func, *args)
+        return None
+
+    def get(self, key):
+        """Wait for an asset, loading it now if nothing has started it yet"""
+        future = self.prefetch(key)
+        return future.result() if future else None
+
+    def ready(self, key):
+        return key in self.futures and self.futures[key].done()
+
+    def pending(self):
+        return sum(1 for future in self.futures.values() if not future.done())
+
+    @contextmanager
+    def measure(self, key):
+        """Time a startup step that has to run on the main thread"""
+        start = time.perf_counter()
+        yield
+        self.timings[key] = time.perf_counter() - start
+
+    def report(self):
+        """Startup timing per asset, slowest first"""
+        if self.startup_time is None:
+            self.startup_time = time.perf_counter() - self.started
+        lines = [f"Startup: {self.startup_time * 1000:.1f} ms"]
+        for key, seconds in sorted(self.timings.items(), key=lambda item: -item[1]):
+            lines.append(f"  {key:20} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,32 @@
+import json
+import os
+from config import *
+
+_manifest = None
+
+
+def load_manifest():
+    """Atlas manifest from the build step, or an empty one if it was not built"""
+    global _manifest
+    if _manifest is None:
+        _manifest = {}
+        if USE_TEXTURE_ATLAS and os.path.exists(ATLAS_MANIFEST):
+            with open(ATLAS_MANIFEST) as f:
+                _manifest = json.load(f)
+    return _manifest
+
+
+def available():
+    return bool(load_manifest())
+
+
+def texture_args(name):
+    """Entity texture arguments for a sprite, as an atlas region if possible"""
+    region = load_manifest().get("regions", {}).get(name)
+    if region is None:
+        return {"texture": f"assets/{name}"}
+    return {
+        "texture": ATLAS_TEXTURE,
+        "texture_offset": tuple(region["uv_offset"]),
+        "texture_scale": tuple(region["uv_scale"]),
+    }
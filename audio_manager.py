@@ -1,90 +1,173 @@
+from collections import deque
 from ursina import Audio
+from config import *
+from asset_loader import warm_sound
+
+SOUNDS = {
+    "enemy_damage": "Enemy_damage.mp3",
+    "enemy_kill": "Enemy_kill.wav",
+    "gameover": "gameover.mp3",
+    "shoot": "Laser_shoot.wav",
+    "boss_die": "Boss_die.wav",
+    "player_damage": "Enemy_damage.mp3",
+}
+
+MUSIC = {
+    "bg_music": ("Background_music.mp3", 1.5),
+    "boss_music": ("Boss_Entry.mp3", 0.5),
+}
+
+# Rarely needed on a given run; decoded on first use or prefetch
+LAZY_AUDIO = ("gameover", "boss_music")
 
 class AudioManager:
     def __init__(self):
+        self.asset_loader = None
         self.audio_cache = {}
-        self.boss_music = None
-        self.bg_music = None
-
-    def preload_audio(self):
-        """Pre-load all audio files"""
-        sounds = {
-            "enemy_damage": "Enemy_damage.mp3",
-            "enemy_kill": "Enemy_kill.wav",
-            "gameover": "gameover.mp3",
-            "shoot": "Laser_shoot.wav",
-            "boss_die": "Boss_die.wav",
-            "player_damage": "Enemy_damage.mp3",
-        }
-
-        for name, file in sounds.items():
+        self.music = {}
+        self.queue = {}
+        self.voices_stolen = 0
+        self.sounds_dropped = 0
+
+    def preload_audio(self, asset_loader):
+        """Start decoding audio files in the background"""
+        self.asset_loader = asset_loader
+        files = dict(SOUNDS)
+        files.update({name: file for name, (file, _) in MUSIC.items()})
+
+        for name, file in files.items():
+            if name in LAZY_AUDIO:
+                asset_loader.register(name, warm_sound, f"assets/{file}")
+            else:
+                asset_loader.load(name, warm_sound, f"assets/{file}")
+
+    def prefetch(self, name):
+        """Hint that a lazily loaded sound will be needed soon"""
+        if self.asset_loader:
+            self.asset_loader.prefetch(name)
+
+    def wait_for(self, name):
+        """Block until the background decode of a file is done"""
+        try:
+            self.asset_loader.get(name)
+        except:
+            pass
+
+    def get_voices(self, name):
+        """Voices for a sound effect, built on first use"""
+        if name not in self.audio_cache:
+            self.wait_for(name)
+            file = SOUNDS[name]
             try:
-                self.audio_cache[name] = Audio(
-                    f"assets/{file}", autoplay=False, loop=False
+                self.audio_cache[name] = deque(
+                    Audio(f"assets/{file}", autoplay=False, loop=False)
+                    for _ in range(AUDIO_VOICES_PER_SOUND)
                 )
             except:
+                self.audio_cache[name] = None
                 print(f"Warning: {file} not found")
+        return self.audio_cache[name]
 
-        try:
-            self.bg_music = Audio(
-                "assets/Background_music.mp3", loop=True, autoplay=False, volume=1.5
-            )
-        except:
-            self.bg_music = None
-            print("Warning: Background_music.mp3 not found")
-
-        try:
-            self.boss_music = Audio(
-                "assets/Boss_entry.mp3", loop=True, autoplay=False, volume=0.5
-            )
-        except:
-            self.boss_music = None
-            print("Warning: Boss_entry.mp3 not found")
+    def load_music(self, name):
+        """Music track, built on first use"""
+        if name not in self.music:
+            self.wait_for(name)
+            file, volume = MUSIC[name]
+            try:
+                self.music[name] = Audio(
+                    f"assets/{file}", loop=True, autoplay=False, volume=volume
+                )
+            except:
+                self.music[name] = None
+                print(f"Warning: {file} not found")
+        return self.music[name]
 
     def play_sound(self, name):
-        """Play a pre-loaded sound effect"""
-        if name in self.audio_cache:
+        """Queue a sound effect for this frame's flush"""
+        if name in SOUNDS:
+            self.queue[name] = self.queue.get(name, 0) + 1
+
+    def voices_playing(self):
+        """Number of sound effect voices currently playing"""
+        return sum(
+            1
+            for voices in self.audio_cache.values()
+            if voices
+            for voice in voices
+            if getattr(voice, "playing", False)
+        )
+
+    def flush(self):
+        """Play each queued sound once, louder when it was triggered repeatedly"""
+        if not self.queue:
+            return
+        playing = self.voices_playing()
+        for name, count in self.queue.items():
+            voices = self.get_voices(name)
+            if not voices:
+                continue
+            # Round-robin order means the front voice is the oldest
+            oldest = 0
+            if playing >= AUDIO_MAX_VOICES:
+                # At the cap the sound can only take over one of its own playing voices
+                oldest = next(
+                    (k for k, voice in enumerate(voices) if getattr(voice, "playing", False)),
+                    None,
+                )
+                if oldest is None:
+                    self.sounds_dropped += 1
+                    continue
+            voices.rotate(-(oldest + 1))
+            voice = voices[-1]
+            if getattr(voice, "playing", False):
+                self.voices_stolen += 1
+            else:
+                playing += 1
+
             try:
-                self.audio_cache[name].play()
+                voice.volume = min(
+                    AUDIO_COALESCE_MAX_GAIN, 1 + AUDIO_COALESCE_BOOST * (count - 1)
+                )
+                voice.play()
             except:
                 pass
+        self.queue.clear()
+
+    def play_music(self, name):
+        music = self.load_music(name)
+        if music and hasattr(music, "play"):
+            music.play()
+
+    def stop_music(self, name):
+        music = self.music.get(name)
+        if music and hasattr(music, "stop"):
+            music.stop()
 
     def start_boss_music(self):
         """Stop background music and start boss music"""
-        if self.bg_music and hasattr(self.bg_music, "stop"):
-            self.bg_music.stop()
-        if self.boss_music and hasattr(self.boss_music, "play"):
-            self.boss_music.play()
+        self.stop_music("bg_music")
+        self.play_music("boss_music")
 
     def stop_boss_music(self):
         """Stop boss music and restart background music"""
-        if self.boss_music and hasattr(self.boss_music, "stop"):
-            self.boss_music.stop()
-        if self.bg_music and hasattr(self.bg_music, "play"):
-            self.bg_music.play()
+        self.stop_music("boss_music")
+        self.play_music("bg_music")
 
     def start_bg_music(self):
         """Start background music"""
-        if self.bg_music and hasattr(self.bg_music, "play"):
-            self.bg_music.play()
+        self.play_music("bg_music")
 
     def stop_all_music(self):
         """Stop all music"""
-        if self.bg_music and hasattr(self.bg_music, "stop"):
-            self.bg_music.stop()
-        if self.boss_music and hasattr(self.boss_music, "stop"):
-            self.boss_music.stop()
+        self.stop_music("bg_music")
+        self.stop_music("boss_music")
 
     def pause_all(self):
         """Pause all music"""
-        if self.bg_music and hasattr(self.bg_music, "pause"):
-            self.bg_music.pause()
-        if self.boss_music and hasattr(self.boss_music, "pause"):
-            self.boss_music.pause()
+        for music in self.music.values():
+            if music and hasattr(music, "pause"):
+                music.pause()
 
     def resume_all(self, is_boss_fight):
         """Resume appropriate music"""
-        if is_boss_fight and self.boss_music and hasattr(self.boss_music, "play"):
-            self.boss_music.play()
-        elif self.bg_music and hasattr(self.bg_music, "play"):
-            self.bg_music.play()
\ No newline at end of file
+        self.play_music("boss_music" if is_boss_fight else "bg_music")
@@ -0,0 +1,37 @@
+from config import *
+from simulation import Inputs, NO_INPUT
+
+
+class AutoPlayer:
+    def __init__(self, deadzone=0.25, aim_tolerance=None, fire_interval=6):
+        self.deadzone = deadzone
+        self.aim_tolerance = ENEMY_SIZE / 2 if aim_tolerance is None else aim_tolerance
+        self.fire_interval = fire_interval
+        self.cooldown = 0
+
+    def target_y(self, sim):
+        """y of the fly closest to the player, falling back to the boss"""
+        enemies = sim.enemy_spawner.enemies
+        n = enemies.count
+        if not n:
+            return None
+        xs = enemies.x[:n].copy()
+        xs[~enemies.alive[:n]] = float("inf")
+        if not enemies.is_boss[:n].all():
+            xs[enemies.is_boss[:n]] = float("inf")
+        i = xs.argmin()
+        if xs[i] == float("inf"):
+            return None
+        return float(enemies.y[i])
+
+    def inputs(self, sim):
+        """Move toward the target and fire once lined up with it"""
+        self.cooldown = max(0, self.cooldown - 1)
+        target = self.target_y(sim)
+        if target is None:
+            return NO_INPUT
+        offset = target - sim.player.y
+        fire = abs(offset) < self.aim_tolerance and self.cooldown == 0
+        if fire:
+            self.cooldown = self.fire_interval
+        return Inputs(offset > self.deadzone, offset < -self.deadzone, fire)
@@ -0,0 +1,67 @@
+import numpy as np
+from ursina import *
+from panda3d.core import InternalName
+from config import *
+import atlas
+
+# Corner offsets of a unit quad, in the same order as its vertices
+CORNER_X = np.array((-1, 1, 1, -1), dtype=np.float32)
+CORNER_Y = np.array((-1, -1, 1, 1), dtype=np.float32)
+
+
+class QuadBatch(Entity):
+    def __init__(self, sprite, capacity=BATCH_CAPACITY, **kwargs):
+        super().__init__(**atlas.texture_args(sprite), double_sided=True, **kwargs)
+        self.capacity = 0
+        self.count = 0
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """Build a mesh with room for capacity quads, all collapsed"""
+        triangles = []
+        for k in range(capacity):
+            v = k * 4
+            triangles += (v, v + 1, v + 2, v + 2, v + 3, v)
+        self.model = Mesh(
+            vertices=[(0, 0, 0)] * (capacity * 4),
+            triangles=triangles,
+            uvs=[(0, 0), (1, 0), (1, 1), (0, 1)] * capacity,
+            mode="triangle",
+            static=False,
+        )
+        self.capacity = capacity
+        self.count = 0
+
+    def vertex_positions(self):
+        """Writable (rows, 3) float view of the mesh's vertex column"""
+        geom_node = self.model.find("**/+GeomNode").node()
+        vdata = geom_node.modify_geom(0).modify_vertex_data()
+        fmt = vdata.get_format()
+        array_index = fmt.get_array_with(InternalName.get_vertex())
+        stride = fmt.get_array(array_index).get_stride() // 4
+        start = fmt.get_column(InternalName.get_vertex()).get_start() // 4
+        floats = np.frombuffer(memoryview(vdata.modify_array(array_index)), dtype=np.float32)
+        return floats.reshape(-1, stride)[:, start : start + 3]
+
+    def update_quads(self, xs, ys, sizes):
+        """Rewrite quad corners in place from centre positions and sizes"""
+        n = len(xs)
+        if n > self.capacity:
+            self.allocate(max(n, self.capacity * 2))
+        positions = self.vertex_positions()
+        half = (np.asarray(sizes, dtype=np.float32) / 2)[:, None]
+        positions[: n * 4, 0] = (np.asarray(xs, dtype=np.float32)[:, None] + half * CORNER_X).ravel()
+        positions[: n * 4, 1] = (np.asarray(ys, dtype=np.float32)[:, None] + half * CORNER_Y).ravel()
+        positions[: n * 4, 2] = 0
+        if n < self.count:
+            # Collapse quads that are no longer used
+            positions[n * 4 : self.count * 4] = 0
+        self.count = n
+
+    @property
+    def draw_calls(self):
+        return 1 if self.count else 0
+
+    @property
+    def vertices(self):
+        return self.count * 4
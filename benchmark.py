@@ -0,0 +1,218 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from config import *
+from simulation import Simulation, Inputs, NO_INPUT
+
+FRAME_DT = 1 / 60
+# Below this many brute-force pairs per frame pruning has too little to skip to judge it
+BROAD_PHASE_MIN_PAIRS = 100
+
+
+def nearest_enemy_y(sim):
+    """y of the enemy closest to the player, or None"""
+    enemies = sim.enemy_spawner.enemies
+    n = enemies.count
+    if not n:
+        return None
+    return float(enemies.y[enemies.x[:n].argmin()])
+
+
+def aim_and_fire(sim, tick, fire_every):
+    """Scripted input: follow the nearest enemy and fire at a fixed rate"""
+    target = nearest_enemy_y(sim)
+    up = down = False
+    if target is not None:
+        up = target > sim.player.y + 0.25
+        down = target < sim.player.y - 0.25
+    return Inputs(up, down, tick % fire_every == 0)
+
+
+def idle(sim):
+    sim.enemy_spawner.stop_spawning()
+    return lambda tick: NO_INPUT
+
+
+def steady_stream(sim):
+    return lambda tick: aim_and_fire(sim, tick, 8)
+
+
+def max_spawn_rate(sim):
+    sim.game_state.score = FLY_SPEED_MAX_SCORE + int(BASE_SPAWN_DELAY / SPAWN_DELAY_REDUCTION_RATE)
+    sim.game_state.boss_spawn_score = 10**9
+    return lambda tick: aim_and_fire(sim, tick, 4)
+
+
+def boss_fight(sim):
+    spawner = sim.enemy_spawner
+    enemies = spawner.enemies
+    spawner.spawn_boss_actual()
+    boss_id = spawner.next_id
+    enemies.health[enemies.row(boss_id)] = 10**6
+
+    def hold_boss(tick):
+        # Pinned on screen at the right edge so it never reaches the player
+        i = enemies.row(boss_id)
+        assert i is not None and enemies.alive[i], f"boss gone at tick {tick}"
+        enemies.x[i] = enemies.prev_x[i] = VIEW_HALF_WIDTH - BOSS_SIZE
+        return aim_and_fire(sim, tick, 1)
+
+    return hold_boss
+
+
+def stress_1000(sim):
+    spawner = sim.enemy_spawner
+    spawner.stop_spawning()
+
+    def refill(tick):
+        for k in range(1000 - spawner.enemies.count):
+            spawner.add_enemy(20 + spawner.rng.uniform(0, 200),
+                              spawner.rng.uniform(MIN_Y, MAX_Y), 10**6)
+        return aim_and_fire(sim, tick, 2)
+
+    return refill
+
+
+SCENARIOS = {
+    "idle": idle,
+    "steady_stream": steady_stream,
+    "max_spawn_rate": max_spawn_rate,
+    "boss_fight": boss_fight,
+    "stress_1000": stress_1000,
+}
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def play(setup, frames, seed, trace=False):
+    """Run one scenario and return per-frame times, allocations, counts, pairs and spawn failures"""
+    sim = Simulation(seed=seed)
+    sim.start()
+    sim.game_state.health = 10**9
+    script = setup(sim)
+    enemies = sim.enemy_spawner.enemies
+    times, allocated, alive, pairs, all_pairs = [], [], [], [], []
+    for tick in range(frames):
+        inputs = script(tick)
+        # Bullets and the player against every enemy, what a brute-force test would check
+        all_pairs.append((len(sim.bullets) + 1) * enemies.count)
+        if trace:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        sim.step(FRAME_DT, inputs)
+        times.append(time.perf_counter() - start)
+        if trace:
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+        alive.append(enemies.count + len(sim.bullets))
+        pairs.append(sim.enemy_spawner.broad_phase.pairs_tested)
+        sim.events.clear()
+    return times, allocated, alive, (pairs, all_pairs), sim.enemy_spawner.spawn_lane.failures
+
+
+def run_scenario(name, frames, seed, repeat=1):
+    """Time a scenario (best of repeat runs), then replay it under tracemalloc"""
+    setup = SCENARIOS[name]
+    times, _, alive, (pairs, all_pairs), spawn_failures = min(
+        (play(setup, frames, seed) for _ in range(repeat)), key=lambda run: sum(run[0])
+    )
+    tracemalloc.start()
+    _, allocated, _, _, _ = play(setup, frames, seed, trace=True)
+    tracemalloc.stop()
+
+    ordered = sorted(times)
+    ms = 1000
+    return {
+        "frames": frames,
+        "mean_ms": sum(times) / frames * ms,
+        "p95_ms": percentile(ordered, 0.95) * ms,
+        "p99_ms": percentile(ordered, 0.99) * ms,
+        "max_ms": ordered[-1] * ms,
+        "alloc_bytes_per_frame": sum(allocated) / frames,
+        "entities_mean": sum(alive) / frames,
+        "entities_max": max(alive),
+        "pairs_per_frame": sum(pairs) / frames,
+        "all_pairs_per_frame": sum(all_pairs) / frames,
+        "spawn_failures": spawn_failures,
+    }
+
+
+def check_broad_phase(results, max_ratio):
+    """Scenarios whose broad phase tests too large a share of all bullet-enemy pairs"""
+    failures = []
+    for name, result in results.items():
+        limit = max_ratio * result["all_pairs_per_frame"]
+        if result["all_pairs_per_frame"] >= BROAD_PHASE_MIN_PAIRS and result["pairs_per_frame"] > limit:
+            failures.append(name)
+            print(f"{name:16} broad phase tested {result['pairs_per_frame']:.1f} pairs/frame,"
+                  f" limit {limit:.1f}  TOO MANY PAIRS")
+    return failures
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """Print per-scenario changes against a baseline; return regressions"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in ("mean_ms", "p95_ms", "p99_ms"):
+            old = baseline[name][metric]
+            new = result[metric]
+            change = (new - old) / old if old else 0
+            flag = ""
+            if change > tolerance and new - old > min_delta:
+                flag = "  REGRESSION"
+                regressions.append((name, metric, change))
+            print(f"{name:16} {metric:8} {old:8.3f} -> {new:8.3f} ms ({change:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless game loop benchmarks")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed slowdown before a metric counts as a regression")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many ms")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timing runs per scenario; the fastest is kept")
+    parser.add_argument("--max-pair-ratio", type=float, default=0.1,
+                        help="largest share of all bullet-enemy pairs the broad phase may test")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenarios:
+        result = run_scenario(name, args.frames, args.seed, args.repeat)
+        results[name] = result
+        print(
+            f"{name:16} mean {result['mean_ms']:.3f} ms  p95 {result['p95_ms']:.3f} ms"
+            f"  p99 {result['p99_ms']:.3f} ms  alloc {result['alloc_bytes_per_frame']:.0f} B/frame"
+            f"  entities {result['entities_mean']:.0f} (max {result['entities_max']})"
+            f"  pairs {result['pairs_per_frame']:.1f}/{result['all_pairs_per_frame']:.0f}"
+            f"  spawn failures {result['spawn_failures']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = check_broad_phase(results, args.max_pair_ratio)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance, args.min_delta):
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+from PIL import Image
+from config import *
+
+
+def pack(sizes, width, padding):
+    """Shelf-pack (w, h) sizes, tallest first; return positions and atlas height"""
+    positions = {}
+    x = y = shelf = 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: -item[1][1]):
+        if x + w > width:
+            x = 0
+            y += shelf + padding
+            shelf = 0
+        positions[name] = (x, y)
+        x += w + padding
+        shelf = max(shelf, h)
+    return positions, y + shelf
+
+
+def build(names, width, padding):
+    images = {name: Image.open(f"assets/{name}.png").convert("RGBA") for name in names}
+    width = max(width, max(image.width for image in images.values()))
+    positions, used_height = pack(
+        {name: image.size for name, image in images.items()}, width, padding
+    )
+    height = 1
+    while height < used_height:
+        height *= 2
+
+    atlas = Image.new("RGBA", (width, height))
+    regions = {}
+    for name, image in images.items():
+        x, y = positions[name]
+        atlas.paste(image, (x, y))
+        w, h = image.size
+        # UV origin is the bottom-left corner of the atlas
+        regions[name] = {
+            "x": x,
+            "y": y,
+            "w": w,
+            "h": h,
+            "uv_offset": [x / width, 1 - (y + h) / height],
+            "uv_scale": [w / width, h / height],
+        }
+    return atlas, {"image": f"{ATLAS_TEXTURE}.png", "size": [width, height], "regions": regions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack sprite PNGs into a texture atlas")
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--padding", type=int, default=2)
+    args = parser.parse_args()
+
+    atlas, manifest = build(ATLAS_SPRITES, args.width, args.padding)
+    atlas.save(f"{ATLAS_TEXTURE}.png", optimize=True)
+    with open(ATLAS_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Packed {len(ATLAS_SPRITES)} sprites into {atlas.width}x{atlas.height}")
+
+
+if __name__ == "__main__":
+    main()
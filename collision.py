@@ -0,0 +1,39 @@
+from bisect import bisect_left, bisect_right
+
+
+def boxes_overlap(ax, ay, a_size, bx, by, b_size):
+    """Overlap test on axis-aligned square boxes given by centre and size"""
+    reach = (a_size + b_size) / 2
+    return abs(ax - bx) < reach and abs(ay - by) < reach
+
+
+class SweepAndPrune:
+    def __init__(self):
+        self.order = []
+        self.bottoms = []
+        self.tops = []
+        self.max_height = 0
+        self.pairs_tested = 0
+        self.total_pairs_tested = 0
+
+    def rebuild(self, ys, sizes, rows=None):
+        """Sort rows by the bottom of their box, once per step"""
+        bottoms = ys - sizes / 2
+        order = bottoms.argsort(kind="stable")
+        self.order = (order if rows is None else rows[order]).tolist()
+        self.bottoms = bottoms[order].tolist()
+        self.tops = (ys + sizes / 2)[order].tolist()
+        self.max_height = float(sizes.max()) if len(sizes) else 0
+        self.total_pairs_tested += self.pairs_tested
+        self.pairs_tested = 0
+
+    def candidates(self, y, height):
+        """Rows whose y-extent overlaps a box of this height centred on y"""
+        low = y - height / 2
+        high = y + height / 2
+        start = bisect_left(self.bottoms, low - self.max_height)
+        end = bisect_right(self.bottoms, high)
+        for k in range(start, end):
+            if self.tops[k] >= low:
+                self.pairs_tested += 1
+                yield self.order[k]
@@ -24,8 +24,110 @@ BASE_SPAWN_DELAY = 1.5
 MIN_SPAWN_DELAY = 0.5
 SPAWN_DELAY_REDUCTION_RATE = 0.002
 
+# Fly health: (minimum score, health) tiers, highest first; 1 below them all
+FLY_HEALTH_TIERS = ((180, 6), (150, 5), (110, 4), (50, 3), (15, 2))
+
 # Bullet
 BULLET_SPEED = 15
+BULLET_SIZE = 1
 
 # Player
-INITIAL_HEALTH = 10
\ No newline at end of file
+INITIAL_HEALTH = 10
+PLAYER_X = -14
+PLAYER_START_Y = 5
+PLAYER_SPEED = 10
+PLAYER_SIZE = 1
+
+# Half the visible width at camera.fov = 20 on 16:9; enemies further right
+# skip collision checks (must stay beyond the bullet range at x = 15)
+VIEW_HALF_WIDTH = 18
+
+# Delay before the first enemy of a game
+FIRST_SPAWN_DELAY = 1.5
+
+# Spawn lane: enemies right of SPAWN_LANE_X block new spawns within
+# SPAWN_CLEARANCE times their size
+SPAWN_LANE_X = 15
+SPAWN_CLEARANCE = 1.8
+
+# Replays: the last game is saved to REPLAY_FILE, with a state checksum
+# every REPLAY_CHECKSUM_INTERVAL ticks
+REPLAY_FILE = "last.replay"
+REPLAY_CHECKSUM_INTERVAL = 60
+
+# Parameter sweeps cache results per configuration here
+SWEEP_CACHE = "sweep_cache.jsonl"
+
+# Leaderboard: top LEADERBOARD_SIZE runs, logged append-only and compacted
+# after LEADERBOARD_COMPACT_EVERY extra lines
+LEADERBOARD_FILE = "leaderboard.jsonl"
+LEADERBOARD_SIZE = 10
+LEADERBOARD_COMPACT_EVERY = 20
+
+# Telemetry: events go to TELEMETRY_DIR in batches of TELEMETRY_BATCH_SIZE,
+# or every TELEMETRY_FLUSH_INTERVAL seconds; batches beyond
+# TELEMETRY_QUEUE_SIZE waiting for the writer are dropped
+TELEMETRY_DIR = "telemetry"
+TELEMETRY_BATCH_SIZE = 256
+TELEMETRY_FLUSH_INTERVAL = 1.0
+TELEMETRY_QUEUE_SIZE = 64
+
+# Quality governor: the budget is one refresh of the display (vsync is on).
+# Over QUALITY_WINDOW frames, a mean frame time above QUALITY_DOWN_RATIO x
+# budget steps one level down; one below QUALITY_UP_RATIO x budget for
+# QUALITY_UP_WINDOWS windows in a row steps up. Levels only touch visuals.
+QUALITY_FALLBACK_FPS = 60
+QUALITY_WINDOW = 60
+QUALITY_DOWN_RATIO = 1.2
+QUALITY_UP_RATIO = 1.05
+QUALITY_UP_WINDOWS = 5
+QUALITY_HISTORY = 32
+QUALITY_LEVELS = (
+    {"shakes": True, "explosions": 6, "animation_fps": None},
+    {"shakes": True, "explosions": 4, "animation_fps": 30},
+    {"shakes": False, "explosions": 2, "animation_fps": 20},
+    {"shakes": False, "explosions": 1, "animation_fps": 10},
+)
+
+# Fixed simulation tick
+SIM_TICK_RATE = 60
+MAX_CATCHUP_TICKS = 5
+
+# Pools
+BULLET_POOL_SIZE = 32
+ENEMY_POOL_SIZE = 24
+BOSS_POOL_SIZE = 1
+ENEMY_STORE_CAPACITY = 256
+
+# Audio
+AUDIO_VOICES_PER_SOUND = 4
+AUDIO_MAX_VOICES = 12
+AUDIO_COALESCE_BOOST = 0.25
+AUDIO_COALESCE_MAX_GAIN = 2.0
+
+# Effects
+EXPLOSION_POOL_SIZE = 6
+
+# Asset loading
+ASSET_LOADER_WORKERS = 4
+STARTUP_TEXTURES = ("BG", "player1", "player2", "Bullet", "fly", "heart")
+PREFETCH_HEALTH = 3
+PREFETCH_BOSS_SCORE_MARGIN = 10
+
+# Texture atlas (built by build_atlas.py)
+USE_TEXTURE_ATLAS = True
+ATLAS_TEXTURE = "assets/atlas"
+ATLAS_MANIFEST = "assets/atlas.json"
+ATLAS_SPRITES = (
+    "BG", "Bullet", "fly", "heart", "player1", "player2",
+    "boom1", "boom2", "boom3", "boom4",
+)
+
+# Draw all bullets and all flies as one dynamic mesh each
+USE_BATCHED_RENDERER = True
+BATCH_CAPACITY = 64
+
+# Profiler
+PROFILER_HISTORY = 600
+PROFILER_OVERLAY_INTERVAL = 30
+PROFILER_CSV = "profile.csv"
@@ -0,0 +1,23 @@
+class EffectQueue:
+    def __init__(self):
+        self.pending = {}
+        self.requested = 0
+        self.last_requested = 0
+        self.last_applied = 0
+
+    def request(self, key, func, *args):
+        """Queue an effect for frame end; of requests sharing a key the strongest runs"""
+        self.requested += 1
+        current = self.pending.get(key)
+        if current is None or args > current[1]:
+            self.pending[key] = (func, args)
+
+    def drain(self):
+        """Run each distinct effect queued this frame once"""
+        pending = self.pending
+        self.pending = {}
+        self.last_requested = self.requested
+        self.last_applied = len(pending)
+        self.requested = 0
+        for func, args in pending.values():
+            func(*args)
@@ -1,56 +1,47 @@
-from ursina import *
 import random
 from config import *
-from entities import Enemy
+from collision import SweepAndPrune, boxes_overlap
+from enemy_store import EnemyStore
+from spawn_allocator import SpawnAllocator
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
 
 
 class EnemySpawner:
-    def __init__(self, game_state, audio_manager, ui_manager):
+    def __init__(self, game_state, emit, scheduler, rng=None):
         self.game_state = game_state
-        self.audio_manager = audio_manager
-        self.ui_manager = ui_manager
-        self.flies = []
-        self.spawn_timer = None
-        self.game_over_callback = None
+        self.emit = emit
+        self.scheduler = scheduler
+        self.rng = rng or random.Random()
+        self.enemies = EnemyStore()
+        self.broad_phase = SweepAndPrune()
+        self.spawn_lane = SpawnAllocator()
+        self.culled = 0
+        self.next_id = 0
 
     def reset(self):
-        """Clear all enemies"""
-        for fly in self.flies:
-            destroy(fly)
-        self.flies.clear()
-        if self.spawn_timer:
-            self.spawn_timer.finish()
-            self.spawn_timer = None
-
-    def pause_spawning(self):
-        """Pause enemy spawning"""
-        if self.spawn_timer:
-            self.spawn_timer.pause()
-
-    def resume_spawning(self):
-        """Resume enemy spawning"""
-        if self.spawn_timer and self.spawn_timer.paused:
-            self.spawn_timer.resume()
-        else:
-            invoke(self.spawn_fly, delay=1.0)
+        """Clear all enemies and pending spawns"""
+        self.enemies.clear()
+        self.spawn_lane.clear()
+        self.scheduler.cancel("spawn")
+        self.scheduler.cancel("boss")
+
+    def schedule_spawn(self, delay):
+        """Queue the next spawn, replacing any pending one"""
+        self.scheduler.schedule(delay, self.spawn_fly, name="spawn")
 
     def stop_spawning(self):
-        """Stop spawning completely"""
-        if self.spawn_timer:
-            self.spawn_timer.pause()
-
-    def hide_all_enemies(self):
-        """Hide all enemies"""
-        for fly in self.flies:
-            fly.enabled = False
-
-    def is_overlap(self, new_y, existing_flies):
-        """Check if spawn position overlaps"""
-        for fly in existing_flies:
-            gap = fly.scale_y * 1.8
-            if abs(new_y - fly.y) < gap:
-                return True
-        return False
+        """Cancel the pending spawn"""
+        self.scheduler.cancel("spawn")
+
+    def add_enemy(self, x, y, health, is_boss=False):
+        """Give a new enemy a row in the store"""
+        self.next_id += 1
+        i = self.enemies.add(self.next_id, x, y, health, is_boss=is_boss)
+        self.spawn_lane.occupy(self.next_id, y, self.enemies.size[i])
+        return i
 
     def spawn_fly(self):
         """Spawn regular enemies automatically"""
@@ -68,59 +59,38 @@ class EnemySpawner:
 
         # Don't spawn during boss fight
         if self.game_state.has_boss_spawned:
-            self.spawn_timer = invoke(self.spawn_fly, delay=2.0)
+            self.schedule_spawn(2.0)
             return
 
-        # Find valid spawn position
-        nearby = [f for f in self.flies if f.x > 15]
-        spawn_y = None
-
-        for _ in range(10):
-            y = random.uniform(MIN_Y, MAX_Y)
-            if not self.is_overlap(y, nearby):
-                spawn_y = y
-                break
+        # Find valid spawn position in the free part of the lane
+        self.spawn_lane.refresh(self.enemies)
+        spawn_y = self.spawn_lane.sample(self.rng)
 
         # Spawn enemy
         if spawn_y is not None:
-            new = Enemy(x=20, y=spawn_y, visible=True)
-            new.current_health = self.game_state.get_fly_health()
-            new.max_health = new.current_health
-            self.flies.append(new)
+            self.add_enemy(20, spawn_y, self.game_state.get_fly_health())
 
         # Calculate next spawn delay
         delay = max(
             MIN_SPAWN_DELAY,
             BASE_SPAWN_DELAY - (self.game_state.score * SPAWN_DELAY_REDUCTION_RATE),
         )
-        self.spawn_timer = invoke(self.spawn_fly, delay=delay)
+        self.schedule_spawn(delay)
+        self.emit("fly_spawn", spawn_y, delay)
 
     def show_boss_warning(self):
-        """Show warning before boss spawns"""
-        camera.shake(duration=2, magnitude=2)
-        self.audio_manager.start_boss_music()
-        invoke(self.spawn_boss_actual, delay=2)
+        """Warn before boss spawns"""
+        self.emit("boss_warning")
+        self.scheduler.schedule(2.0, self.spawn_boss_actual, name="boss")
 
     def spawn_boss_actual(self):
         """Create and spawn boss"""
-        if self.spawn_timer:
-            self.spawn_timer.pause()
-
         boss_health = self.game_state.get_boss_health()
-        boss = Enemy(
-            is_boss=True,
-            x=20,
-            y=random.uniform(MIN_Y + 2, MAX_Y - 2),
-            visible=True,
+        self.add_enemy(
+            20, self.rng.uniform(MIN_Y + 2, MAX_Y - 2), boss_health, is_boss=True
         )
-        boss.current_health = boss_health
-        boss.max_health = boss_health
-        self.flies.append(boss)
         self.game_state.has_boss_spawned = True
-
-        # Show boss HP
-        self.ui_manager.boss_health_text.text = f"BOSS HP: {boss_health}"
-        self.ui_manager.boss_health_text.enabled = True
+        self.emit("boss_spawned", boss_health)
 
     def handle_boss_defeat(self):
         """Handle boss being defeated"""
@@ -128,9 +98,6 @@ class EnemySpawner:
         self.game_state.bosses_defeated_count += 1
         self.game_state.enemies_killed_since_boss = 0
 
-        self.ui_manager.boss_health_text.enabled = False
-        self.audio_manager.stop_boss_music()
-
         # Increase difficulty every 2 bosses
         if self.game_state.bosses_defeated_count % 2 == 0:
             self.game_state.normal_fly_health_bonus += 1
@@ -138,11 +105,10 @@ class EnemySpawner:
         self.game_state.boss_spawn_score = (
             self.game_state.score + MIN_ENEMIES_BEFORE_BOSS
         )
+        self.emit("boss_defeated")
 
         # Resume spawning
-        if self.spawn_timer:
-            self.spawn_timer.finish()
-        invoke(self.spawn_fly, delay=1.0)
+        self.schedule_spawn(1.0)
 
     def handle_boss_escape(self):
         """Handle boss escaping"""
@@ -151,15 +117,10 @@ class EnemySpawner:
         self.game_state.boss_spawn_score = (
             self.game_state.score + MIN_ENEMIES_BEFORE_BOSS
         )
-
-        self.ui_manager.boss_health_text.enabled = False
-        self.audio_manager.stop_boss_music()
+        self.emit("boss_escaped")
 
         # Resume spawning
-        if self.spawn_timer and self.spawn_timer.paused:
-            self.spawn_timer.resume()
-        else:
-            invoke(self.spawn_fly, delay=1.0)
+        self.schedule_spawn(1.0)
 
     def get_current_fly_speed(self):
         """Calculate enemy speed"""
@@ -185,53 +146,60 @@ class EnemySpawner:
         )
         return lerp(MIN_BOSS_SPEED, MAX_BOSS_SPEED, t)
 
-    def update_enemies(self, player, ui_manager):
-        """Update all enemies each frame"""
+    def hits(self, body):
+        """Rows of live enemies overlapping a body"""
+        enemies = self.enemies
+        for i in self.broad_phase.candidates(body.y, body.size):
+            if enemies.alive[i] and boxes_overlap(
+                body.x, body.y, body.size, enemies.x[i], enemies.y[i], enemies.size[i]
+            ):
+                yield i
+
+    def damage_player(self, damage):
+        """Take health from the player, ending the game at zero"""
+        self.game_state.health -= damage
+        if self.game_state.health <= 0:
+            self.game_state.state = "game_over"
+            self.emit("game_over")
+
+    def update_enemies(self, dt, player):
+        """Move enemies and resolve player collisions and escapes"""
         fly_speed = self.get_current_fly_speed()
         boss_speed = self.get_current_boss_speed()
-
-        for fly in self.flies[:]:
-            speed = boss_speed if fly.is_boss else fly_speed
-            fly.x -= speed * time.dt
-
-            # Enemy collides with player
-            if fly.intersects(player).hit:
-                ui_manager.show_explosion(fly.position)
-
-                damage = BOSS_DAMAGE if fly.is_boss else 1
-
-                if fly.is_boss:
-                    self.audio_manager.play_sound("boss_die")
-                    self.handle_boss_defeat()
-                else:
-                    self.audio_manager.play_sound("enemy_kill")
-
-                self.flies.remove(fly)
-                destroy(fly)
-
-                self.game_state.health -= damage
-                ui_manager.update_hearts(self.game_state.health)
-                ui_manager.flash_damage()
-                self.audio_manager.play_sound("player_damage")
-                player.shake()
-
-                if self.game_state.health <= 0 and self.game_over_callback:
-                    self.game_over_callback()
-
-            # Enemy escapes off-screen
-            elif fly.x < -12:
-                damage = BOSS_DAMAGE if fly.is_boss else 1
-
-                if fly.is_boss:
-                    self.handle_boss_escape()
-
-                self.flies.remove(fly)
-                destroy(fly)
-
-                self.game_state.health -= damage
-                ui_manager.update_hearts(self.game_state.health)
-                ui_manager.flash_damage()
-                self.audio_manager.play_sound("player_damage")
-
-                if self.game_state.health <= 0 and self.game_over_callback:
-                    self.game_over_callback()
\ No newline at end of file
+        enemies = self.enemies
+        n = enemies.count
+
+        enemies.advance(dt, fly_speed, boss_speed)
+
+        # Index on-screen enemies for this step's player and bullet checks;
+        # the rest only move until they come into view
+        rows = enemies.activate(VIEW_HALF_WIDTH)
+        self.culled = n - len(rows)
+        self.broad_phase.rebuild(enemies.y[rows], enemies.size[rows], rows)
+
+        # Enemy collides with player
+        for i in list(self.hits(player)):
+            is_boss = bool(enemies.is_boss[i])
+            enemies.kill(i)
+            self.emit(
+                "player_hit", int(enemies.ids[i]), float(enemies.x[i]),
+                float(enemies.y[i]), is_boss,
+            )
+            if is_boss:
+                self.handle_boss_defeat()
+
+            self.damage_player(BOSS_DAMAGE if is_boss else 1)
+            if self.game_state.state != "playing":
+                return
+
+        # Enemy escapes off-screen
+        for i in enemies.escaped(-12):
+            is_boss = bool(enemies.is_boss[i])
+            enemies.kill(i)
+            self.emit("enemy_escaped", int(enemies.ids[i]), is_boss)
+            if is_boss:
+                self.handle_boss_escape()
+
+            self.damage_player(BOSS_DAMAGE if is_boss else 1)
+            if self.game_state.state != "playing":
+                return
@@ -0,0 +1,108 @@
+import numpy as np
+from config import *
+
+FLY = 0
+BOSS = 1
+
+COLUMNS = (
+    ("ids", np.int64),
+    ("x", np.float64),
+    ("prev_x", np.float64),
+    ("y", np.float64),
+    ("size", np.float64),
+    ("health", np.int32),
+    ("max_health", np.int32),
+    ("speed_class", np.int8),
+    ("is_boss", bool),
+    ("alive", bool),
+    ("active", bool),
+)
+
+
+class EnemyStore:
+    def __init__(self, capacity=None):
+        capacity = capacity or ENEMY_STORE_CAPACITY
+        self.count = 0
+        self.rows = {}
+        for name, dtype in COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def grow(self):
+        """Double the capacity of every column"""
+        capacity = len(self.x) * 2
+        for name, dtype in COLUMNS:
+            new = np.zeros(capacity, dtype=dtype)
+            new[: self.count] = getattr(self, name)[: self.count]
+            setattr(self, name, new)
+
+    def add(self, enemy_id, x, y, health, is_boss=False):
+        """Append an enemy row and return its index"""
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.ids[i] = enemy_id
+        self.x[i] = x
+        self.prev_x[i] = x
+        self.y[i] = y
+        self.size[i] = BOSS_SIZE if is_boss else ENEMY_SIZE
+        self.health[i] = health
+        self.max_health[i] = health
+        self.speed_class[i] = BOSS if is_boss else FLY
+        self.is_boss[i] = is_boss
+        self.alive[i] = True
+        self.active[i] = False
+        self.rows[enemy_id] = i
+        self.count += 1
+        return i
+
+    def remove(self, i):
+        """Swap-remove row i by moving the last row into its place"""
+        last = self.count - 1
+        del self.rows[int(self.ids[i])]
+        if i != last:
+            self.rows[int(self.ids[last])] = i
+            for name, _ in COLUMNS:
+                column = getattr(self, name)
+                column[i] = column[last]
+        self.count = last
+
+    def kill(self, i):
+        """Mark row i dead; it is dropped at the next compact()"""
+        self.alive[i] = False
+
+    def compact(self):
+        """Swap-remove every dead row"""
+        for i in np.flatnonzero(~self.alive[: self.count])[::-1]:
+            self.remove(i)
+
+    def clear(self):
+        """Drop every row"""
+        self.count = 0
+        self.rows.clear()
+
+    def row(self, enemy_id):
+        """Current index of an enemy, or None once it is removed"""
+        return self.rows.get(enemy_id)
+
+    def damage(self, i, amount=1):
+        """Subtract health from row i and return what is left"""
+        self.health[i] -= amount
+        return int(self.health[i])
+
+    def advance(self, dt, fly_speed, boss_speed):
+        """Move every enemy left by its speed class in one pass"""
+        n = self.count
+        speeds = np.array((fly_speed, boss_speed))
+        self.prev_x[:n] = self.x[:n]
+        self.x[:n] -= speeds[self.speed_class[:n]] * dt
+
+    def activate(self, limit):
+        """Mark rows whose left edge has crossed limit active; return the active rows"""
+        n = self.count
+        self.active[:n] = self.x[:n] - self.size[:n] / 2 <= limit
+        return np.flatnonzero(self.active[:n])
+
+    def escaped(self, limit):
+        """Indices of live enemies left of limit"""
+        n = self.count
+        return np.flatnonzero((self.x[:n] < limit) & self.alive[:n])
@@ -1,91 +1,114 @@
 from ursina import *
 from config import *
+import atlas
 
 
-class Player(Animation):
+class AtlasAnimation(Entity):
+    def __init__(self, frames, fps=12, loop=True, autoplay=True, duration=None,
+                 external_clock=False, hide_when_done=False, **kwargs):
+        self.frames = [atlas.texture_args(name) for name in frames]
+        super().__init__(model="quad", **self.frames[0], **kwargs)
+        self.fps = len(self.frames) / duration if duration else fps
+        self.duration = len(self.frames) / self.fps
+        self.loop = loop
+        self.playing = autoplay
+        self.external_clock = external_clock
+        self.hide_when_done = hide_when_done
+        self.time = 0
+        self.frame = 0
+
+    def show_frame(self, i):
+        """Point the quad at frame i"""
+        if i != self.frame:
+            for name, value in self.frames[i].items():
+                setattr(self, name, value)
+            self.frame = i
+
+    def start(self):
+        """Play from the first frame"""
+        self.time = 0
+        self.playing = True
+        self.frame = -1
+        self.show_frame(0)
+
+    def update(self):
+        if not self.external_clock:
+            self.advance(time.dt)
+
+    def advance(self, dt):
+        """Move the animation dt seconds forward"""
+        if not self.playing:
+            return
+        self.time += dt
+        i = int(self.time * self.fps)
+        if i >= len(self.frames):
+            if not self.loop:
+                self.playing = False
+                if self.hide_when_done:
+                    self.visible = False
+                return
+            self.time %= self.duration
+            i %= len(self.frames)
+        self.show_frame(i)
+
+
+class Player(AtlasAnimation):
     def __init__(self):
         super().__init__(
-            "assets/player", 
-            collider="box", 
-            y=5, 
-            x=-14, 
+            ("player1", "player2"), 
+            y=PLAYER_START_Y, 
+            x=PLAYER_X, 
             enabled=False
         )
 
 
 class Bullet(Entity):
-    def __init__(self, game_state, audio_manager, enemy_spawner, ui_manager, **kwargs):
+    def __init__(self, **kwargs):
         super().__init__(
             model="quad",
-            texture="assets/Bullet",
-            collider="box",
+            **atlas.texture_args("Bullet"),
+            scale=BULLET_SIZE,
             name="bullet",
             **kwargs,
         )
-        self.speed = BULLET_SPEED
-        self.game_state = game_state
-        self.audio_manager = audio_manager
-        self.enemy_spawner = enemy_spawner
-        self.ui_manager = ui_manager
-
-    def update(self):
-        """Move bullet and check collisions"""
-        if self.game_state.state == "playing":
-            self.x += self.speed * time.dt
+        self.pool = None
 
-            # Check collision with enemies
-            for fly in self.enemy_spawner.flies:
-                if self.intersects(fly).hit:
-                    self.handle_bullet_hit(fly)
-                    return
-
-            # Destroy if off-screen
-            if self.x > 15:
-                destroy(self)
-
-    def handle_bullet_hit(self, fly):
-        """Process bullet hitting an enemy"""
-        fly.current_health -= 1
-        destroy(self)
-        fly.shake(duration=0.1, magnitude=0.5)
-
-        self.audio_manager.play_sound("enemy_damage")
-
-        # Update boss HP display
-        if fly.is_boss:
-            self.ui_manager.boss_health_text.text = f"BOSS HP: {fly.current_health}"
-
-        # Check if enemy is destroyed
-        if fly.current_health <= 0:
-            self.ui_manager.show_explosion(fly.position)
-
-            if fly.is_boss:
-                score_value = BOSS_POINTS
-                self.audio_manager.play_sound("boss_die")
-                self.enemy_spawner.handle_boss_defeat()
-            else:
-                score_value = 1
-                self.audio_manager.play_sound("enemy_kill")
-                self.game_state.enemies_killed_since_boss += 1
-
-            self.enemy_spawner.flies.remove(fly)
-            destroy(fly)
-            self.game_state.score += score_value
-            self.ui_manager.score_label.text = f"Score: {self.game_state.score}"
+    def release(self):
+        """Return bullet to its pool, or destroy it if it has none"""
+        if self.pool:
+            self.pool.release(self)
+        else:
+            destroy(self)
 
 
 class Enemy(Entity):
     def __init__(self, is_boss=False, **kwargs):
         super().__init__(
             model="cube",
-            texture="assets/fly",
-            collider="box",
+            **atlas.texture_args("fly"),
             scale=BOSS_SIZE if is_boss else ENEMY_SIZE,
             **kwargs,
         )
-        self.current_health = 1
-        self.max_health = 1
         self.is_boss = is_boss
+        self.pool = None
         if is_boss:
             self.color = color.red
-            self.name = "boss_fly"
\ No newline at end of file
+            self.name = "boss_fly"
+
+    def reset(self, x, y):
+        """Restore a pooled enemy to a fresh spawn state"""
+        for anim in self.animations:
+            anim.kill()
+        self.animations.clear()
+        self.position = (x, y, 0)
+        self.rotation = (0, 0, 0)
+        self.scale = BOSS_SIZE if self.is_boss else ENEMY_SIZE
+        self.color = color.red if self.is_boss else color.white
+        self.enabled = True
+
+    def release(self):
+        """Return enemy to its pool, or destroy it if it has none"""
+        if self.pool:
+            self.pool.release(self)
+        else:
+            destroy(self)
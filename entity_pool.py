@@ -0,0 +1,81 @@
+from config import *
+from entities import Bullet, Enemy
+
+
+class EntityPool:
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.free = []
+        self.active = set()
+        self.peak = 0
+        self.misses = 0
+        for _ in range(size):
+            self.free.append(self.create())
+
+    def create(self):
+        """Build a new disabled entity owned by this pool"""
+        entity = self.factory()
+        entity.pool = self
+        entity.enabled = False
+        return entity
+
+    def acquire(self):
+        """Hand out a free entity, growing the pool if none is left"""
+        if self.free:
+            entity = self.free.pop()
+        else:
+            self.misses += 1
+            entity = self.create()
+        self.active.add(entity)
+        self.peak = max(self.peak, len(self.active))
+        return entity
+
+    def release(self, entity):
+        """Return an entity to the pool"""
+        if entity not in self.active:
+            return
+        self.active.remove(entity)
+        entity.enabled = False
+        self.free.append(entity)
+
+    def release_all(self):
+        """Return every active entity to the pool"""
+        for entity in list(self.active):
+            self.release(entity)
+
+    @property
+    def in_use(self):
+        return len(self.active)
+
+    def stats(self):
+        """Pool usage counters for sizing"""
+        return {
+            "size": len(self.free) + len(self.active),
+            "in_use": self.in_use,
+            "peak": self.peak,
+            "misses": self.misses,
+        }
+
+
+class BulletPool(EntityPool):
+    def __init__(self, size=BULLET_POOL_SIZE):
+        super().__init__(lambda: Bullet(x=100, y=100), size)
+
+    def fire(self, x, y):
+        """Place a pooled bullet at the given position"""
+        bullet = self.acquire()
+        bullet.x = x
+        bullet.y = y
+        bullet.enabled = True
+        return bullet
+
+
+class EnemyPool(EntityPool):
+    def __init__(self, is_boss=False, size=ENEMY_POOL_SIZE):
+        super().__init__(lambda: Enemy(is_boss=is_boss, x=100, y=100), size)
+
+    def spawn(self, x, y):
+        """Place a pooled enemy in its fresh spawn state"""
+        enemy = self.acquire()
+        enemy.reset(x, y)
+        return enemy
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+from config import *
+import settings
+from autoplayer import AutoPlayer
+from benchmark import percentile
+from simulation import Simulation
+
+
+def play_game(seed, max_ticks, overrides=None):
+    """Play one headless game with the autoplayer and return its outcome"""
+    with settings.override(overrides or {}):
+        sim = Simulation(seed=seed)
+        sim.start()
+        bot = AutoPlayer()
+        bosses = 0
+        start = time.perf_counter()
+        while sim.game_state.state == "playing" and sim.ticks < max_ticks:
+            sim.step(sim.tick_dt, bot.inputs(sim))
+            for event in sim.events:
+                if event[0] == "boss_spawned":
+                    bosses += 1
+            sim.events.clear()
+        elapsed = time.perf_counter() - start
+    state = sim.game_state
+    return {
+        "seed": seed,
+        "ticks": sim.ticks,
+        "survival_s": sim.ticks * sim.tick_dt,
+        "died": state.state == "game_over",
+        "score": state.score,
+        "bosses_spawned": bosses,
+        "bosses_defeated": state.bosses_defeated_count,
+        "elapsed_s": elapsed,
+        "worker": os.getpid(),
+    }
+
+
+def play_game_args(args):
+    return play_game(*args)
+
+
+def summarize(games):
+    """Survival, score, boss and throughput figures over many games"""
+    survival = sorted(game["survival_s"] for game in games)
+    scores = sorted(game["score"] for game in games)
+    spawned = sum(game["bosses_spawned"] for game in games)
+    defeated = sum(game["bosses_defeated"] for game in games)
+
+    workers = defaultdict(lambda: [0, 0.0])
+    for game in games:
+        workers[game["worker"]][0] += game["ticks"]
+        workers[game["worker"]][1] += game["elapsed_s"]
+
+    return {
+        "games": len(games),
+        "deaths": sum(game["died"] for game in games),
+        "survival_mean_s": sum(survival) / len(games),
+        "survival_p10_s": percentile(survival, 0.10),
+        "survival_p50_s": percentile(survival, 0.50),
+        "survival_p90_s": percentile(survival, 0.90),
+        "score_mean": sum(scores) / len(games),
+        "score_p10": percentile(scores, 0.10),
+        "score_p50": percentile(scores, 0.50),
+        "score_p90": percentile(scores, 0.90),
+        "score_max": scores[-1],
+        "boss_kill_rate": defeated / spawned if spawned else 0.0,
+        "ticks_per_s_by_worker": {
+            str(pid): ticks / elapsed for pid, (ticks, elapsed) in workers.items() if elapsed
+        },
+    }
+
+
+def run_farm(games, seed=1, max_ticks=36000, workers=None, overrides=None):
+    """Play games with consecutive seeds across a process pool"""
+    jobs = [(seed + k, max_ticks, overrides) for k in range(games)]
+    with Pool(workers) as pool:
+        return list(pool.imap_unordered(play_game_args, jobs, chunksize=4))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many headless games with the autoplayer")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-ticks", type=int, default=36000,
+                        help="end games still running after this many ticks")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-o", "--output", help="write the summary and every game as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    games = run_farm(args.games, args.seed, args.max_ticks, args.workers)
+    elapsed = time.perf_counter() - start
+    summary = summarize(games)
+
+    total_ticks = sum(game["ticks"] for game in games)
+    print(f"{len(games)} games, {total_ticks} ticks in {elapsed:.1f} s"
+          f" ({total_ticks / elapsed:.0f} ticks/s over {args.workers} workers)")
+    print(f"survival  mean {summary['survival_mean_s']:.1f} s  p10 {summary['survival_p10_s']:.1f}"
+          f"  p50 {summary['survival_p50_s']:.1f}  p90 {summary['survival_p90_s']:.1f}")
+    print(f"score     mean {summary['score_mean']:.1f}  p10 {summary['score_p10']}"
+          f"  p50 {summary['score_p50']}  p90 {summary['score_p90']}  max {summary['score_max']}")
+    print(f"bosses    kill rate {summary['boss_kill_rate']:.1%}  deaths {summary['deaths']}")
+    for pid, rate in summary["ticks_per_s_by_worker"].items():
+        print(f"worker {pid:>8} {rate:9.0f} ticks/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "games": games}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
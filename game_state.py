@@ -1,4 +1,3 @@
-from ursina import window
 from config import *
 
 
@@ -31,23 +30,18 @@ class GameState:
 
     def get_fly_health(self):
         """Calculate enemy health based on score"""
-        if self.score >= 180:
-            base = 6
-        elif self.score >= 150:
-            base = 5
-        elif self.score >= 110:
-            base = 4
-        elif self.score >= 50:
-            base = 3
-        elif self.score >= 15:
-            base = 2
-        else:
-            base = 1
+        base = 1
+        for min_score, health in FLY_HEALTH_TIERS:
+            if self.score >= min_score:
+                base = health
+                break
         return base + self.normal_fly_health_bonus
 
     def load_high_score(self):
-        """Load high score from storage"""
+        """Load the high score kept in window storage before the leaderboard"""
         try:
+            from ursina import window
+
             result = window.storage.get("high_score", False)
             if result and hasattr(result, "value") and result.value:
                 self.high_score = int(result.value)
@@ -55,10 +49,5 @@ class GameState:
             self.high_score = 0
 
     def save_high_score(self):
-        """Save high score to storage"""
-        if self.score > self.high_score:
-            self.high_score = self.score
-            try:
-                window.storage.set("high_score", str(self.high_score), False)
-            except:
-                pass
\ No newline at end of file
+        """Raise the high score to this game's score"""
+        self.high_score = max(self.high_score, self.score)
\ No newline at end of file
@@ -0,0 +1,249 @@
+import random
+import numpy as np
+from ursina import *
+from config import *
+from entity_pool import BulletPool, EnemyPool
+from batch_renderer import QuadBatch
+from effects import EffectQueue
+
+
+class GameView:
+    def __init__(self, sim, audio_manager, ui_manager, player):
+        self.sim = sim
+        self.game_state = sim.game_state
+        self.audio_manager = audio_manager
+        self.ui_manager = ui_manager
+        self.player = player
+        self.boss_pool = EnemyPool(is_boss=True, size=BOSS_POOL_SIZE)
+        self.bullets = {}
+        self.enemies = {}
+        self.batched = USE_BATCHED_RENDERER
+        if self.batched:
+            # Bullets and flies are quads of one mesh, only the boss is an entity
+            self.bullet_batch = QuadBatch("Bullet")
+            self.fly_batch = QuadBatch("fly")
+            self.fly_shakes = {}
+            self.pools = (self.boss_pool,)
+        else:
+            self.bullet_pool = BulletPool()
+            self.fly_pool = EnemyPool(size=ENEMY_POOL_SIZE)
+            self.pools = (self.bullet_pool, self.fly_pool, self.boss_pool)
+        self.game_over_callback = None
+        self.effects = EffectQueue()
+        self.shakes = True
+        self.culled = 0
+        self.handlers = {
+            "shoot": self.on_shoot,
+            "enemy_hit": self.on_enemy_hit,
+            "enemy_killed": self.on_enemy_killed,
+            "player_hit": self.on_player_hit,
+            "enemy_escaped": self.on_enemy_escaped,
+            "boss_warning": self.on_boss_warning,
+            "boss_spawned": self.on_boss_spawned,
+            "boss_defeated": self.on_boss_gone,
+            "boss_escaped": self.on_boss_gone,
+            "game_over": self.on_game_over,
+        }
+
+    def clear(self):
+        """Return every bullet and enemy entity to its pool"""
+        for entity in self.bullets.values():
+            entity.release()
+        for entity in self.enemies.values():
+            entity.release()
+        self.bullets.clear()
+        self.enemies.clear()
+        if self.batched:
+            self.bullet_batch.update_quads((), (), ())
+            self.fly_batch.update_quads((), (), ())
+            self.fly_shakes.clear()
+
+    def update(self):
+        """Mirror the simulation onto entities and play its events"""
+        self.sync()
+        self.handle_events()
+        self.effects.drain()
+        self.ui_manager.flush_hud()
+
+    def set_quality(self, settings):
+        """Turn camera, player and enemy shakes on or off"""
+        self.shakes = settings["shakes"]
+        if not self.shakes and self.batched:
+            self.fly_shakes.clear()
+
+    def shake_camera(self, duration, magnitude):
+        camera.shake(duration=duration, magnitude=magnitude)
+
+    def end_game(self):
+        if self.game_over_callback:
+            self.game_over_callback()
+
+    def sync(self):
+        """Copy simulation positions onto entities, interpolated between ticks"""
+        alpha = self.sim.alpha
+        player = self.sim.player
+        self.player.y = lerp(player.prev_y, player.y, alpha)
+        self.player.rotation_z = self.sim.player_tilt
+
+        # Only what is inside the camera's view is drawn
+        half_width = camera.fov * window.aspect_ratio / 2
+        bullets = self.sim.bullets
+        if half_width < 15 + BULLET_SIZE / 2:
+            bullets = [b for b in bullets if b.x - BULLET_SIZE / 2 <= half_width]
+
+        store = self.sim.enemy_spawner.enemies
+        n = store.count
+        xs = store.prev_x[:n] + (store.x[:n] - store.prev_x[:n]) * alpha
+        visible = xs - store.size[:n] / 2 <= half_width
+        ids = store.ids[:n][visible]
+        xs = xs[visible]
+        ys = store.y[:n][visible]
+        sizes = store.size[:n][visible]
+        is_boss = store.is_boss[:n][visible]
+        self.culled = len(self.sim.bullets) - len(bullets) + n - len(ids)
+
+        if self.batched:
+            self.sync_bullet_batch(bullets, alpha)
+            flies = ~is_boss
+            self.sync_fly_batch(ids[flies], xs[flies], ys[flies], sizes[flies])
+            self.sync_enemy_entities(ids[is_boss], xs[is_boss], ys[is_boss], is_boss[is_boss])
+        else:
+            self.sync_bullet_entities(bullets, alpha)
+            self.sync_enemy_entities(ids, xs, ys, is_boss)
+
+    def sync_bullet_entities(self, bullets, alpha):
+        """One pooled entity per bullet"""
+        for bullet in bullets:
+            x = lerp(bullet.prev_x, bullet.x, alpha)
+            entity = self.bullets.get(bullet.id)
+            if entity is None:
+                self.bullets[bullet.id] = self.bullet_pool.fire(x, bullet.y)
+            else:
+                entity.x = x
+        if len(self.bullets) != len(bullets):
+            self.drop_missing(self.bullets, {bullet.id for bullet in bullets})
+
+    def sync_enemy_entities(self, ids, xs, ys, is_boss):
+        """One pooled entity per enemy row given"""
+        ids = ids.tolist()
+        for enemy_id, x, y, boss in zip(ids, xs.tolist(), ys.tolist(), is_boss.tolist()):
+            entity = self.enemies.get(enemy_id)
+            if entity is None:
+                pool = self.boss_pool if boss else self.fly_pool
+                self.enemies[enemy_id] = pool.spawn(x, y)
+            else:
+                entity.x = x
+        if len(self.enemies) != len(ids):
+            self.drop_missing(self.enemies, set(ids))
+
+    def sync_bullet_batch(self, bullets, alpha):
+        """Every bullet as a quad of one mesh"""
+        n = len(bullets)
+        xs = np.fromiter((lerp(b.prev_x, b.x, alpha) for b in bullets), float, n)
+        ys = np.fromiter((b.y for b in bullets), float, n)
+        self.bullet_batch.update_quads(xs, ys, np.full(n, BULLET_SIZE))
+
+    def sync_fly_batch(self, ids, xs, ys, sizes):
+        """Every fly as a quad of one mesh, jittered while shaking"""
+        if self.fly_shakes:
+            ys = ys.copy()
+            for enemy_id, remaining in list(self.fly_shakes.items()):
+                rows = np.flatnonzero(ids == enemy_id)
+                remaining -= time.dt
+                if remaining <= 0 or not len(rows):
+                    del self.fly_shakes[enemy_id]
+                    continue
+                self.fly_shakes[enemy_id] = remaining
+                xs[rows] += random.uniform(-0.5, 0.5)
+                ys[rows] += random.uniform(-0.5, 0.5)
+        self.fly_batch.update_quads(xs, ys, sizes)
+
+    def render_stats(self):
+        """Draw calls, vertices and pool usage of bullets and enemies"""
+        draw_calls = len(self.bullets) + len(self.enemies)
+        vertices = len(self.bullets) * 4 + len(self.enemies) * 24
+        if self.batched:
+            for batch in (self.bullet_batch, self.fly_batch):
+                draw_calls += batch.draw_calls
+                vertices += batch.vertices
+        pools = [pool.stats() for pool in self.pools]
+        return {
+            "draw_calls": draw_calls,
+            "vertices": vertices,
+            "culled": self.culled,
+            "no_collide": self.sim.enemy_spawner.culled,
+            "pool_peak": sum(stats["peak"] for stats in pools),
+            "pool_miss": sum(stats["misses"] for stats in pools),
+        }
+
+    def drop_missing(self, entities, live_ids):
+        """Release entities whose simulation object is gone"""
+        for entity_id in [i for i in entities if i not in live_ids]:
+            entities.pop(entity_id).release()
+
+    def handle_events(self):
+        """Turn simulation events into sound and UI effects"""
+        for event in self.sim.events:
+            handler = self.handlers.get(event[0])
+            if handler:
+                handler(*event[1:])
+        self.sim.events.clear()
+
+    def on_shoot(self):
+        self.audio_manager.play_sound("shoot")
+
+    def on_enemy_hit(self, enemy_id, is_boss, health):
+        entity = self.enemies.get(enemy_id)
+        if self.shakes and entity:
+            self.effects.request(("shake", enemy_id), entity.shake, 0.1, 0.5)
+        elif self.shakes and self.batched:
+            self.fly_shakes[enemy_id] = 0.1
+
+        self.audio_manager.play_sound("enemy_damage")
+
+        # Update boss HP display
+        if is_boss:
+            self.ui_manager.hud.set("boss_hp", health)
+
+    def on_enemy_killed(self, enemy_id, x, y, is_boss):
+        self.effects.request(("explosion", enemy_id), self.ui_manager.show_explosion, (x, y, 0))
+        self.audio_manager.play_sound("boss_die" if is_boss else "enemy_kill")
+        self.ui_manager.hud.set("score", self.game_state.score)
+        state = self.game_state
+        if state.score >= state.boss_spawn_score - PREFETCH_BOSS_SCORE_MARGIN:
+            self.audio_manager.prefetch("boss_music")
+
+    def on_player_hit(self, enemy_id, x, y, is_boss):
+        self.effects.request(("explosion", enemy_id), self.ui_manager.show_explosion, (x, y, 0))
+        self.audio_manager.play_sound("boss_die" if is_boss else "enemy_kill")
+        self.on_player_damage()
+        if self.shakes:
+            self.effects.request("player_shake", self.player.shake)
+
+    def on_enemy_escaped(self, enemy_id, is_boss):
+        self.on_player_damage()
+
+    def on_player_damage(self):
+        if self.game_state.health <= PREFETCH_HEALTH:
+            self.audio_manager.prefetch("gameover")
+        self.ui_manager.hud.set("health", self.game_state.health)
+        self.effects.request("flash", self.ui_manager.flash_damage)
+        if self.shakes:
+            self.effects.request("camera_shake", self.shake_camera, 0.2, 1.5)
+        self.audio_manager.play_sound("player_damage")
+
+    def on_boss_warning(self):
+        if self.shakes:
+            self.effects.request("camera_shake", self.shake_camera, 2, 2)
+        self.audio_manager.start_boss_music()
+
+    def on_boss_spawned(self, health):
+        self.ui_manager.hud.set("boss_hp", health)
+        self.ui_manager.hud.set("boss_visible", True)
+
+    def on_boss_gone(self):
+        self.ui_manager.hud.set("boss_visible", False)
+        self.audio_manager.stop_boss_music()
+
+    def on_game_over(self):
+        self.effects.request("game_over", self.end_game)
@@ -0,0 +1,27 @@
+class HudModel:
+    def __init__(self):
+        self.values = {}
+        self.dirty = set()
+        self.text_rebuilds = 0
+        self.last_rebuilds = 0
+
+    def set(self, name, value):
+        """Record a HUD value, marking it dirty only if it changed"""
+        if name in self.values and self.values[name] == value:
+            return
+        self.values[name] = value
+        self.dirty.add(name)
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+    def take_dirty(self):
+        """Changed values since the last flush, clearing the dirty set"""
+        changed = [(name, self.values[name]) for name in self.dirty]
+        self.dirty.clear()
+        return changed
+
+    def count_rebuilds(self, rebuilds):
+        """Record how many texts were regenerated by one flush"""
+        self.last_rebuilds = rebuilds
+        self.text_rebuilds += rebuilds
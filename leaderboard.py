@@ -0,0 +1,120 @@
+import json
+import os
+import queue
+import threading
+import time
+from bisect import insort
+from config import *
+
+
+def rank_key(entry):
+    return (-entry["score"], entry["timestamp"])
+
+
+class Leaderboard:
+    def __init__(self, path=LEADERBOARD_FILE, size=LEADERBOARD_SIZE,
+                 compact_every=LEADERBOARD_COMPACT_EVERY):
+        self.path = path
+        self.size = size
+        self.compact_every = compact_every
+        self.entries = []
+        self.log_lines = 0
+        self.write_errors = 0
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self.run, name="leaderboard", daemon=True)
+        self.writer.start()
+
+    def load(self):
+        """Read the log, keeping only the top runs in memory"""
+        entries = []
+        damaged = False
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    self.log_lines += 1
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        damaged = True  # torn last line from an interrupted write
+        except OSError:
+            return self
+        entries.sort(key=rank_key)
+        self.entries = entries[: self.size]
+        if damaged or self.log_lines > self.size + self.compact_every:
+            self.compact()
+        return self
+
+    @property
+    def high_score(self):
+        return self.entries[0]["score"] if self.entries else 0
+
+    def record(self, score, duration, bosses_defeated):
+        """Add a finished run and return its rank, or None if it missed the board"""
+        entry = {
+            "score": score,
+            "duration": round(duration, 2),
+            "bosses_defeated": bosses_defeated,
+            "timestamp": time.time(),
+        }
+        insort(self.entries, entry, key=rank_key)
+        rank = self.entries.index(entry) + 1
+        del self.entries[self.size :]
+
+        self.queue.put(("append", entry))
+        self.log_lines += 1
+        if self.log_lines >= self.size + self.compact_every:
+            self.compact()
+        return rank if rank <= self.size else None
+
+    def compact(self):
+        """Queue a rewrite of the log down to the current top runs"""
+        self.queue.put(("compact", list(self.entries)))
+        self.log_lines = len(self.entries)
+
+    def run(self):
+        """Writer thread: batch queued appends, rewrite on compaction"""
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            appends = []
+            for item in batch:
+                if item is None:
+                    self.write(appends)
+                    return
+                kind, payload = item
+                if kind == "append":
+                    appends.append(payload)
+                else:
+                    appends = []
+                    self.rewrite(payload)
+            self.write(appends)
+
+    def write(self, entries):
+        if not entries:
+            return
+        try:
+            with open(self.path, "a") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        except OSError:
+            self.write_errors += 1
+
+    def rewrite(self, entries):
+        """Write the top runs to a temp file and swap it in atomically"""
+        temp = f"{self.path}.tmp"
+        try:
+            with open(temp, "w") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.path)
+        except OSError:
+            self.write_errors += 1
+
+    def close(self, timeout=1.0):
+        """Flush pending writes and stop the writer thread"""
+        self.queue.put(None)
+        self.writer.join(timeout)
@@ -1,69 +1,178 @@
+import atexit
+import sys
 from ursina import *
 from config import *
 from game_state import *
 from audio_manager import *
 from ui_manager import *
 from entities import *
-from enemy_spawner import *
+from simulation import *
+from game_view import *
+from profiler import Profiler
+from asset_loader import AssetLoader, warm_texture
+from replay import Replay, ReplayRecorder, ReplayPlayer
+from leaderboard import Leaderboard
+from telemetry import Telemetry
+from quality import QualityGovernor
+import atlas
+import settings
  
 app = Ursina(title="shooting game")
 
 window.vsync = True
 window.fullscreen = True
 
-# Initialize managers
-game_state = GameState()
+# Decode textures and audio in the background while the menus are built
+asset_loader = AssetLoader()
+scene_textures = ("atlas",) if atlas.available() else STARTUP_TEXTURES
+for name in scene_textures:
+    asset_loader.load(name, warm_texture, f"assets/{name}.png")
 audio_manager = AudioManager()
-ui_manager = UIManager(game_state)
-enemy_spawner = EnemySpawner(game_state, audio_manager, ui_manager)
+audio_manager.preload_audio(asset_loader)
+
+# Play back a recorded game with: python main.py --replay last.replay
+replay = None
+if "--replay" in sys.argv:
+    replay = Replay.load(sys.argv[sys.argv.index("--replay") + 1])
+    settings.apply(replay.config)
+recorder = ReplayRecorder()
+telemetry = Telemetry()
+
+# Initialize managers
+sim = Simulation()
+game_state = sim.game_state
+with asset_loader.measure("ui"):
+    ui_manager = UIManager(game_state, asset_loader)
+
+# Background, player and view are built by build_scene() once their
+# textures are decoded, so the controls screen shows without waiting
+player = None
+view = None
+fire_pressed = False
+pairs_mark = 0
+
+
+def display_refresh_rate():
+    """Refresh rate of the current display mode, or QUALITY_FALLBACK_FPS if unknown"""
+    try:
+        info = app.pipe.get_display_information()
+        index = info.get_current_display_mode_index()
+        if 0 <= index < info.get_total_display_modes():
+            rate = info.get_display_mode_refresh_rate(index)
+            if rate > 0:
+                return rate
+    except:
+        pass
+    return QUALITY_FALLBACK_FPS
 
-# Background
-Entity(model="quad", texture="assets/BG", scale=36, z=1)
 
-# Player
-player = Player()
+# Frames are paced by vsync, so the budget is one refresh of the display
+governor = QualityGovernor(budget=1 / display_refresh_rate())
+
+# Profiler sections (wrapped only while the overlay is on)
+profiler = Profiler()
+profiler.watch(sys.modules[__name__], "update", "update")
+profiler.watch(sim, "step", "step")
+profiler.watch(sim.enemy_spawner, "update_enemies", "enemies")
+profiler.watch(sim, "update_bullets", "bullets")
+profiler.watch(ui_manager, "show_explosion", "explosion")
+profiler.watch(ui_manager, "flash_damage", "flash")
+profiler.watch(audio_manager, "play_sound", "audio")
+profiler.watch(audio_manager, "flush", "audio")
 
 Sky()
 camera.orthographic = True
 camera.fov = 20
 
 
+def build_scene():
+    """Create the background, player and view, waiting for textures still loading"""
+    global player, view
+    for name in scene_textures:
+        asset_loader.get(name)
+    with asset_loader.measure("background"):
+        Entity(model="quad", **atlas.texture_args("BG"), scale=36, z=1)
+    with asset_loader.measure("player"):
+        player = Player()
+    view = GameView(sim, audio_manager, ui_manager, player)
+    view.game_over_callback = game_over
+    profiler.watch(view, "update", "view")
+
+
 def update():
     """Main game loop"""
+    global fire_pressed, pairs_mark
+    if view is None and all(asset_loader.ready(name) for name in scene_textures):
+        build_scene()
+
+    if profiler.enabled:
+        profiler.end_frame()
+        if view is not None and profiler.frame_count % PROFILER_OVERLAY_INTERVAL == 0:
+            counters = view.render_stats()
+            pairs = sim.enemy_spawner.broad_phase.total_pairs_tested
+            counters["pairs/frame"] = round((pairs - pairs_mark) / PROFILER_OVERLAY_INTERVAL)
+            pairs_mark = pairs
+            counters["text_rebuilds"] = ui_manager.hud.text_rebuilds
+            counters["effects"] = f"{view.effects.last_applied}/{view.effects.last_requested}"
+            counters["quality"] = governor.level
+            counters["timers"] = sim.scheduler.pending
+            ui_manager.show_profile(profiler.summary(), counters)
+
+    telemetry.frame(time.dt)
+
+    if asset_loader.startup_time is None and not asset_loader.pending():
+        print(asset_loader.report())
+
+    # Explosions keep playing on the menus, but not while paused
+    if game_state.state != "paused":
+        ui_manager.update(time.dt)
+
     if game_state.state != "playing":
+        audio_manager.flush()
         return
 
-    # Player movement
-    up = held_keys["w"] or held_keys["up arrow"]
-    down = held_keys["s"] or held_keys["down arrow"]
-    player.y += up * 10 * time.dt
-    player.y -= down * 10 * time.dt
-    player.y = clamp(player.y, MIN_Y, MAX_Y)
-    player.rotation_z = -20 if up else (20 if down else 0)
+    governor.update(time.dt)
+    inputs = Inputs(
+        up=bool(held_keys["w"] or held_keys["up arrow"]),
+        down=bool(held_keys["s"] or held_keys["down arrow"]),
+        fire=fire_pressed,
+    )
+    if sim.advance(time.dt, inputs):
+        fire_pressed = False
+    telemetry.record_events(sim.events, sim.ticks)
+    view.update()
 
-    # Update enemies
-    enemy_spawner.update_enemies(player, ui_manager)
+    # Play this frame's sounds now that its events have been handled
+    audio_manager.flush()
 
 
 def input(key):
     """Handle keyboard input"""
+    global fire_pressed
     if key == "q" or key == "escape":
-        application.quit()
+        quit_game()
 
     # Pause toggle
     if key == "p":
         if game_state.state == "playing":
             game_state.state = "paused"
             ui_manager.pause_screen.enabled = True
-            enemy_spawner.pause_spawning()
             audio_manager.pause_all()
         elif game_state.state == "paused":
             game_state.state = "playing"
             ui_manager.pause_screen.enabled = False
-            enemy_spawner.resume_spawning()
             audio_manager.resume_all(game_state.has_boss_spawned)
         return
 
+    # Profiler overlay and CSV dump
+    if key == "o":
+        profiler.toggle()
+        ui_manager.profiler_text.enabled = profiler.enabled
+        return
+    if key == "x" and profiler.history:
+        print(f"Profile written to {profiler.export_csv()}")
+        return
+
     # Restart
     if game_state.state == "game_over" and key == "r":
         start_game()
@@ -75,42 +184,90 @@ def input(key):
             start_game()
             return
         if game_state.state == "playing":
-            audio_manager.play_sound("shoot")
-            Bullet(y=player.y, x=player.x + 2, game_state=game_state, 
-                   audio_manager=audio_manager, enemy_spawner=enemy_spawner, 
-                   ui_manager=ui_manager)
+            fire_pressed = True
+
+
+def apply_quality(old, new, mean):
+    """Push a governor level change to the view and UI"""
+    settings = governor.settings
+    view.set_quality(settings)
+    ui_manager.set_quality(settings)
+    telemetry.record("quality", sim.ticks, old=old, new=new, mean_ms=round(mean * 1000, 3))
+
+
+def shutdown():
+    """Finish the leaderboard, replay and telemetry writes; safe to repeat"""
+    leaderboard.close()
+    recorder.close()
+    telemetry.close(timeout=5.0)
+    asset_loader.shutdown()
+
+
+def quit_game():
+    """Quit from the keyboard or the EXIT button"""
+    shutdown()
+    application.quit()
 
 
 def start_game():
     """Start new game"""
-    game_state.reset()
-    enemy_spawner.reset()
+    global fire_pressed
+    if view is None:
+        build_scene()
+    if replay:
+        sim.start(replay.seed)
+        ReplayPlayer(replay).attach(sim)
+    else:
+        sim.start()
+        recorder.start(sim)
+    view.clear()
+    fire_pressed = False
     ui_manager.start_game(game_state)
-    player.y = 5
+    telemetry.record("game_start", seed=sim.seed, replay=bool(replay))
+    player.y = sim.player.y
     player.enabled = True
     audio_manager.start_bg_music()
-    invoke(enemy_spawner.spawn_fly, delay=1.5)
 
 
 def game_over():
     """Handle game over"""
     game_state.state = "game_over"
-    enemy_spawner.stop_spawning()
+    telemetry.record(
+        "game_end", sim.ticks, score=game_state.score,
+        duration=round(sim.ticks * sim.tick_dt, 2),
+        bosses_defeated=game_state.bosses_defeated_count, **telemetry.stats(),
+    )
     audio_manager.stop_all_music()
     audio_manager.play_sound("gameover")
     player.enabled = False
+    if not replay:
+        leaderboard.record(
+            game_state.score, sim.ticks * sim.tick_dt, game_state.bosses_defeated_count
+        )
     ui_manager.show_game_over(game_state)
-    enemy_spawner.hide_all_enemies()
+    view.clear()
+    if replay:
+        playback = sim.tick_observer
+        if playback.divergence is not None:
+            print(f"Replay diverged at tick {playback.divergence}")
+    else:
+        recorder.save_in_background()
 
 
 # Setup callbacks
 ui_manager.start_button.on_click = start_game
 ui_manager.restart_button.on_click = start_game
-enemy_spawner.game_over_callback = game_over
+ui_manager.quit_button.on_click = quit_game
+governor.on_change = apply_quality
 
 # Initialize
-audio_manager.preload_audio()
+leaderboard = Leaderboard().load()
 game_state.load_high_score()
-ui_manager.high_score_label.text = f"Best: {game_state.high_score}"
+game_state.high_score = max(game_state.high_score, leaderboard.high_score)
+
+# Closing the window or any other exit still flushes the writers
+atexit.register(shutdown)
+ui_manager.hud.set("best", game_state.high_score)
+ui_manager.flush_hud()
 
 app.run()
\ No newline at end of file
@@ -0,0 +1,103 @@
+import csv
+import time
+from collections import deque
+from config import *
+
+
+class Profiler:
+    def __init__(self, history=PROFILER_HISTORY):
+        self.enabled = False
+        self.history = deque(maxlen=history)
+        self.sections = {}
+        self.targets = []
+        self.hooks = []
+        self.frame_start = None
+        self.frame_count = 0
+
+    def watch(self, owner, attr, section):
+        """Time owner.attr under a section name while enabled"""
+        self.targets.append((owner, attr, section))
+        if self.enabled:
+            self.hook(owner, attr, section)
+
+    def hook(self, owner, attr, section):
+        own = attr in vars(owner)
+        original = getattr(owner, attr)
+        setattr(owner, attr, self.timed(original, section))
+        self.hooks.append((owner, attr, original if own else None))
+
+    def timed(self, func, section):
+        sections = self.sections
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sections[section] = sections.get(section, 0) + time.perf_counter() - start
+
+        return wrapper
+
+    def enable(self):
+        """Swap in timing wrappers; nothing is wrapped while disabled"""
+        if self.enabled:
+            return
+        for owner, attr, section in self.targets:
+            self.hook(owner, attr, section)
+        self.sections.clear()
+        self.frame_start = None
+        self.enabled = True
+
+    def disable(self):
+        """Restore the original functions"""
+        for owner, attr, original in reversed(self.hooks):
+            if original is None:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, original)
+        self.hooks.clear()
+        self.enabled = False
+
+    def toggle(self):
+        """Switch profiling on or off"""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def end_frame(self):
+        """Close the current frame and push its section times to the history"""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            frame = dict(self.sections)
+            frame["frame"] = now - self.frame_start
+            self.history.append(frame)
+            self.frame_count += 1
+        self.sections.clear()
+        self.frame_start = now
+
+    def section_names(self):
+        names = []
+        for frame in self.history:
+            for name in frame:
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def summary(self):
+        """Mean milliseconds per section over the history"""
+        count = len(self.history) or 1
+        return {
+            name: sum(frame.get(name, 0) for frame in self.history) / count * 1000
+            for name in self.section_names()
+        }
+
+    def export_csv(self, path=PROFILER_CSV):
+        """Write one row per recorded frame, times in milliseconds"""
+        names = self.section_names()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for frame in self.history:
+                writer.writerow([f"{frame.get(name, 0) * 1000:.4f}" for name in names])
+        return path
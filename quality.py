@@ -0,0 +1,62 @@
+import time
+from collections import deque
+from config import *
+
+
+class QualityGovernor:
+    def __init__(self, levels=QUALITY_LEVELS, budget=1 / QUALITY_FALLBACK_FPS,
+                 window=QUALITY_WINDOW):
+        self.levels = levels
+        self.budget = budget
+        self.frame_times = deque(maxlen=window)
+        self.total = 0.0
+        self.level = 0
+        self.frames_in_window = 0
+        self.good_windows = 0
+        self.transitions = deque(maxlen=QUALITY_HISTORY)
+        self.on_change = None
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    @property
+    def mean(self):
+        return self.total / len(self.frame_times) if self.frame_times else 0.0
+
+    def update(self, dt):
+        """Add a frame time; step quality down or up when the rolling mean calls for it"""
+        if len(self.frame_times) == self.frame_times.maxlen:
+            self.total -= self.frame_times[0]
+        self.frame_times.append(dt)
+        self.total += dt
+        self.frames_in_window += 1
+
+        # Judge each full window of frames, all taken at the current level
+        if self.frames_in_window < self.frame_times.maxlen:
+            return
+        self.frames_in_window = 0
+        mean = self.mean
+        if mean > self.budget * QUALITY_DOWN_RATIO:
+            self.good_windows = 0
+            if self.level < len(self.levels) - 1:
+                self.set_level(self.level + 1)
+        elif mean < self.budget * QUALITY_UP_RATIO:
+            # Step up only after QUALITY_UP_WINDOWS good windows in a row
+            self.good_windows += 1
+            if self.good_windows >= QUALITY_UP_WINDOWS and self.level > 0:
+                self.set_level(self.level - 1)
+        else:
+            self.good_windows = 0
+
+    def set_level(self, level):
+        """Switch level, recording the transition and telling on_change"""
+        old = self.level
+        if level == old:
+            return
+        self.level = level
+        self.frames_in_window = 0
+        self.good_windows = 0
+        self.transitions.append((time.time(), old, level, self.mean))
+        if self.on_change:
+            self.on_change(old, level, self.mean)
@@ -0,0 +1,215 @@
+import argparse
+import json
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from config import *
+import settings
+from simulation import Simulation, Inputs, NO_INPUT
+
+MAGIC = b"RPLY"
+VERSION = 1
+HEADER = struct.Struct("<4sHQ")
+COUNT = struct.Struct("<I")
+RUN = struct.Struct("<BH")
+CHECK = struct.Struct("<II")
+STATE = struct.Struct("<iiidI")
+
+
+def pack_inputs(inputs):
+    return inputs.up | inputs.down << 1 | inputs.fire << 2
+
+
+def unpack_inputs(flags):
+    return Inputs(bool(flags & 1), bool(flags & 2), bool(flags & 4))
+
+
+def checksum(sim):
+    """CRC of the state a diverging run would change first"""
+    state = sim.game_state
+    enemies = sim.enemy_spawner.enemies
+    n = enemies.count
+    crc = zlib.crc32(
+        STATE.pack(
+            state.score, state.health, state.bosses_defeated_count,
+            sim.player.y, len(sim.bullets),
+        )
+    )
+    for column in (enemies.x, enemies.y, enemies.health):
+        crc = zlib.crc32(column[:n].tobytes(), crc)
+    return crc
+
+
+class Replay:
+    def __init__(self, seed, config, flags=None, checksums=None):
+        self.seed = seed
+        self.config = config
+        self.flags = bytearray(flags or ())
+        self.checksums = list(checksums or ())
+
+    @property
+    def ticks(self):
+        return len(self.flags)
+
+    def inputs(self, tick):
+        """Inputs of a 0-based tick, or no input past the end"""
+        if tick < len(self.flags):
+            return unpack_inputs(self.flags[tick])
+        return NO_INPUT
+
+    def encode_runs(self):
+        """Run-length encode the per-tick input flags"""
+        runs = []
+        for flags in self.flags:
+            if runs and runs[-1][0] == flags and runs[-1][1] < 0xFFFF:
+                runs[-1][1] += 1
+            else:
+                runs.append([flags, 1])
+        return runs
+
+    def save(self, path):
+        """Write the replay as a header and a compressed body"""
+        config = json.dumps(self.config, separators=(",", ":")).encode()
+        runs = self.encode_runs()
+        body = bytearray()
+        body += COUNT.pack(len(config)) + config
+        body += COUNT.pack(len(runs))
+        for flags, length in runs:
+            body += RUN.pack(flags, length)
+        body += COUNT.pack(len(self.checksums))
+        for tick, crc in self.checksums:
+            body += CHECK.pack(tick, crc)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed))
+            f.write(zlib.compress(bytes(body), 9))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay written by save()"""
+        with open(path, "rb") as f:
+            magic, version, seed = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} replay")
+            body = zlib.decompress(f.read())
+
+        offset = 0
+
+        def read(layout):
+            nonlocal offset
+            values = layout.unpack_from(body, offset)
+            offset += layout.size
+            return values
+
+        (size,) = read(COUNT)
+        config = json.loads(body[offset : offset + size])
+        offset += size
+        flags = bytearray()
+        for _ in range(read(COUNT)[0]):
+            value, length = read(RUN)
+            flags += bytes((value,)) * length
+        checksums = [read(CHECK) for _ in range(read(COUNT)[0])]
+        return cls(seed, config, flags, checksums)
+
+
+class ReplayRecorder:
+    def __init__(self, interval=None):
+        self.interval = interval or REPLAY_CHECKSUM_INTERVAL
+        self.replay = None
+        self.writer = None
+
+    def start(self, sim):
+        """Record the game the simulation has just started"""
+        self.replay = Replay(sim.seed, settings.snapshot())
+        sim.tick_observer = self
+
+    def on_tick(self, sim, inputs):
+        self.replay.flags.append(pack_inputs(inputs))
+        if sim.ticks % self.interval == 0 or sim.game_state.state != "playing":
+            self.replay.checksums.append((sim.ticks, checksum(sim)))
+
+    def save(self, path=None):
+        return self.replay.save(path or REPLAY_FILE)
+
+    def save_in_background(self, path=None):
+        """Encode and write the finished game on a writer thread"""
+        if self.writer is None:
+            self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="replay")
+        return self.writer.submit(self.replay.save, path or REPLAY_FILE)
+
+    def close(self):
+        """Wait for a save still being written"""
+        if self.writer is not None:
+            self.writer.shutdown(wait=True)
+            self.writer = None
+
+
+class ReplayPlayer:
+    def __init__(self, replay):
+        self.replay = replay
+        self.expected = dict(replay.checksums)
+        self.verified = 0
+        self.divergence = None
+
+    def attach(self, sim):
+        """Feed the simulation recorded inputs and check it against the recording"""
+        sim.input_source = self.next_inputs
+        sim.tick_observer = self
+
+    def next_inputs(self, sim):
+        return self.replay.inputs(sim.ticks - 1)
+
+    def on_tick(self, sim, inputs):
+        expected = self.expected.get(sim.ticks)
+        if expected is None or self.divergence is not None:
+            return
+        if checksum(sim) == expected:
+            self.verified += 1
+        else:
+            self.divergence = sim.ticks
+
+    @property
+    def finished(self):
+        return self.divergence is not None or self.verified == len(self.expected)
+
+
+def play(replay):
+    """Re-run a replay headless as fast as possible and return the player"""
+    with settings.override(replay.config):
+        sim = Simulation()
+        sim.start(replay.seed)
+        player = ReplayPlayer(replay)
+        player.attach(sim)
+        while sim.game_state.state == "playing" and sim.ticks < replay.ticks:
+            sim.step(sim.tick_dt)
+            if player.divergence is not None:
+                break
+    player.sim = sim
+    return player
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded game headless")
+    parser.add_argument("path", nargs="?", default=REPLAY_FILE)
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    start = time.perf_counter()
+    player = play(replay)
+    elapsed = time.perf_counter() - start
+    sim = player.sim
+
+    game_time = sim.ticks * sim.tick_dt
+    print(
+        f"{sim.ticks} ticks ({game_time:.1f} s of play) in {elapsed:.3f} s,"
+        f" {game_time / elapsed:.0f}x real time; score {sim.game_state.score}"
+    )
+    if player.divergence is not None:
+        print(f"Diverged at tick {player.divergence}")
+        raise SystemExit(1)
+    print(f"{player.verified}/{len(player.expected)} checksums match")
+
+
+if __name__ == "__main__":
+    main()
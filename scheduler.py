@@ -0,0 +1,70 @@
+import heapq
+from itertools import count
+
+
+class Timer:
+    __slots__ = ("due", "func", "args", "name", "cancelled")
+
+    def __init__(self, due, func, args, name):
+        self.due = due
+        self.func = func
+        self.args = args
+        self.name = name
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop this timer from firing"""
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self):
+        self.time = 0.0
+        self.heap = []
+        self.named = {}
+        self.order = count()
+
+    def schedule(self, delay, func, *args, name=None):
+        """Call func(*args) after delay seconds of game time
+
+        A named timer replaces any pending timer with the same name.
+        """
+        if name is not None:
+            self.cancel(name)
+        timer = Timer(self.time + delay, func, args, name)
+        heapq.heappush(self.heap, (timer.due, next(self.order), timer))
+        if name is not None:
+            self.named[name] = timer
+        return timer
+
+    def cancel(self, name):
+        """Cancel the pending timer with this name, if any"""
+        timer = self.named.pop(name, None)
+        if timer:
+            timer.cancel()
+
+    def is_pending(self, name):
+        timer = self.named.get(name)
+        return timer is not None and not timer.cancelled
+
+    def clear(self):
+        """Drop every pending timer"""
+        for _, _, timer in self.heap:
+            timer.cancel()
+        self.heap.clear()
+        self.named.clear()
+
+    @property
+    def pending(self):
+        return sum(1 for _, _, timer in self.heap if not timer.cancelled)
+
+    def update(self, dt):
+        """Advance the clock and fire every timer that is due"""
+        self.time += dt
+        heap = self.heap
+        while heap and heap[0][0] <= self.time:
+            timer = heapq.heappop(heap)[2]
+            if timer.name is not None and self.named.get(timer.name) is timer:
+                del self.named[timer.name]
+            if not timer.cancelled:
+                timer.func(*timer.args)
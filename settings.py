@@ -0,0 +1,43 @@
+import sys
+from contextlib import contextmanager
+import config
+
+STORABLE = (bool, int, float, str, tuple, list)
+
+
+def snapshot():
+    """Config values that can be written out and applied again later"""
+    return {
+        name: value
+        for name, value in vars(config).items()
+        if name.isupper() and isinstance(value, STORABLE)
+    }
+
+
+def apply(values):
+    """Set config values, also in modules that star-imported them; return the old ones"""
+    modules = [m for m in list(sys.modules.values()) if m is not None and m is not config]
+    previous = {}
+    for name, value in values.items():
+        if not hasattr(config, name):
+            continue
+        current = getattr(config, name)
+        if isinstance(current, tuple) and isinstance(value, list):
+            value = tuple(value)
+        previous[name] = current
+        setattr(config, name, value)
+        for module in modules:
+            namespace = vars(module)
+            if namespace.get(name) is current:
+                namespace[name] = value
+    return previous
+
+
+@contextmanager
+def override(values):
+    """Apply config values for the duration of a block"""
+    previous = apply(values)
+    try:
+        yield
+    finally:
+        apply(previous)
@@ -0,0 +1,159 @@
+import random
+from collections import namedtuple
+from config import *
+from game_state import GameState
+from enemy_spawner import EnemySpawner
+from scheduler import Scheduler
+
+Inputs = namedtuple("Inputs", "up down fire")
+NO_INPUT = Inputs(False, False, False)
+
+
+class Body:
+    __slots__ = ("id", "x", "y", "prev_x", "prev_y", "size")
+
+    def __init__(self, body_id, x, y, size):
+        self.id = body_id
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.size = size
+
+
+class Simulation:
+    def __init__(self, seed=None):
+        self.seeds = random.Random(seed)
+        self.seed = None
+        self.rng = random.Random()
+        self.game_state = GameState()
+        self.events = []
+        self.scheduler = Scheduler()
+        self.enemy_spawner = EnemySpawner(
+            self.game_state, self.emit, self.scheduler, self.rng
+        )
+        self.player = Body(0, PLAYER_X, PLAYER_START_Y, PLAYER_SIZE)
+        self.player_tilt = 0
+        self.bullets = []
+        self.next_bullet_id = 0
+        self.ticks = 0
+        self.tick_dt = 1 / SIM_TICK_RATE
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped_time = 0.0
+        self.input_source = None
+        self.tick_observer = None
+
+    def emit(self, *event):
+        """Queue an event for the view"""
+        self.events.append(event)
+
+    def start(self, seed=None):
+        """Start new game, from a given seed or the next one"""
+        self.seed = self.seeds.getrandbits(32) if seed is None else seed
+        self.rng.seed(self.seed)
+        self.game_state.reset()
+        self.scheduler.clear()
+        self.enemy_spawner.reset()
+        self.enemy_spawner.schedule_spawn(FIRST_SPAWN_DELAY)
+        self.bullets.clear()
+        self.enemy_spawner.next_id = 0
+        self.next_bullet_id = 0
+        self.ticks = 0
+        self.player.y = PLAYER_START_Y
+        self.player.prev_y = PLAYER_START_Y
+        self.player_tilt = 0
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, frame_dt, inputs=NO_INPUT):
+        """Run the fixed ticks covered by frame_dt and return how many ran"""
+        self.accumulator += frame_dt
+        ticks = 0
+        while self.accumulator >= self.tick_dt:
+            if ticks == MAX_CATCHUP_TICKS:
+                # Drop the backlog rather than spiral further behind
+                self.dropped_time += self.accumulator
+                self.accumulator = 0.0
+                break
+            self.step(self.tick_dt, inputs if ticks == 0 else inputs._replace(fire=False))
+            self.accumulator -= self.tick_dt
+            ticks += 1
+        self.alpha = self.accumulator / self.tick_dt
+        return ticks
+
+    def step(self, dt, inputs=NO_INPUT):
+        """Advance the game by dt seconds"""
+        if self.game_state.state != "playing":
+            return
+        self.ticks += 1
+        if self.input_source is not None:
+            inputs = self.input_source(self)
+
+        if inputs.fire:
+            self.fire()
+
+        # Player movement
+        player = self.player
+        player.prev_y = player.y
+        player.y += inputs.up * PLAYER_SPEED * dt
+        player.y -= inputs.down * PLAYER_SPEED * dt
+        player.y = min(max(player.y, MIN_Y), MAX_Y)
+        self.player_tilt = -20 if inputs.up else (20 if inputs.down else 0)
+
+        self.enemy_spawner.update_enemies(dt, player)
+        if self.game_state.state == "playing":
+            self.scheduler.update(dt)
+            self.update_bullets(dt)
+        self.enemy_spawner.enemies.compact()
+        if self.tick_observer is not None:
+            self.tick_observer.on_tick(self, inputs)
+
+    def fire(self):
+        """Spawn a bullet in front of the player"""
+        self.next_bullet_id += 1
+        self.bullets.append(
+            Body(self.next_bullet_id, self.player.x + 2, self.player.y, BULLET_SIZE)
+        )
+        self.emit("shoot")
+
+    def update_bullets(self, dt):
+        """Move bullets and check collisions"""
+        survivors = []
+        for bullet in self.bullets:
+            bullet.prev_x = bullet.x
+            bullet.x += BULLET_SPEED * dt
+
+            # Check collision with enemies
+            hit = next(self.enemy_spawner.hits(bullet), None)
+            if hit is not None:
+                self.handle_bullet_hit(hit)
+            # Keep while on-screen
+            elif bullet.x <= 15:
+                survivors.append(bullet)
+        self.bullets = survivors
+
+    def handle_bullet_hit(self, i):
+        """Process bullet hitting an enemy"""
+        enemies = self.enemy_spawner.enemies
+        health = enemies.damage(i)
+        enemy_id = int(enemies.ids[i])
+        is_boss = bool(enemies.is_boss[i])
+        self.emit("enemy_hit", enemy_id, is_boss, health)
+
+        # Check if enemy is destroyed
+        if health <= 0:
+            enemies.kill(i)
+            self.emit(
+                "enemy_killed", enemy_id, float(enemies.x[i]), float(enemies.y[i]),
+                is_boss,
+            )
+
+            if is_boss:
+                score_value = BOSS_POINTS
+                self.enemy_spawner.handle_boss_defeat()
+            else:
+                score_value = 1
+                self.game_state.enemies_killed_since_boss += 1
+
+            self.game_state.score += score_value
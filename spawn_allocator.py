@@ -0,0 +1,78 @@
+from bisect import bisect_right, insort
+from config import *
+
+
+class SpawnAllocator:
+    def __init__(self, low=None, high=None, lane_x=None):
+        # Read config now rather than at import so overrides apply
+        self.low = MIN_Y if low is None else low
+        self.high = MAX_Y if high is None else high
+        self.lane_x = SPAWN_LANE_X if lane_x is None else lane_x
+        self.blocked = []
+        self.occupants = {}
+        self.starts = []
+        self.cumulative = []
+        self.stale = True
+        self.spawns = 0
+        self.failures = 0
+
+    def clear(self):
+        """Free the whole lane"""
+        self.blocked.clear()
+        self.occupants.clear()
+        self.stale = True
+
+    def occupy(self, enemy_id, y, size):
+        """Block the y-range around an enemy entering the lane"""
+        reach = size * SPAWN_CLEARANCE
+        span = (y - reach, y + reach, enemy_id)
+        insort(self.blocked, span)
+        self.occupants[enemy_id] = span
+        self.stale = True
+
+    def release(self, enemy_id):
+        """Free the y-range held by an enemy"""
+        span = self.occupants.pop(enemy_id, None)
+        if span is not None:
+            self.blocked.remove(span)
+            self.stale = True
+
+    def refresh(self, store):
+        """Release occupants that died or moved out of the lane"""
+        for enemy_id in list(self.occupants):
+            i = store.row(enemy_id)
+            if i is None or not store.alive[i] or store.x[i] <= self.lane_x:
+                self.release(enemy_id)
+
+    def rebuild(self):
+        """Turn the sorted blocked spans into free intervals with running lengths"""
+        self.starts = []
+        self.cumulative = []
+        total = 0.0
+        cursor = self.low
+        for start, end, _ in self.blocked + [(self.high, self.high, None)]:
+            start = min(start, self.high)
+            if start > cursor:
+                self.starts.append(cursor)
+                self.cumulative.append(total)
+                total += start - cursor
+            cursor = max(cursor, end)
+        self.cumulative.append(total)
+        self.stale = False
+
+    def free_space(self):
+        """Total length of the lane a new fly can spawn in"""
+        if self.stale:
+            self.rebuild()
+        return self.cumulative[-1]
+
+    def sample(self, rng):
+        """Uniform y from the free intervals, or None if the lane is full"""
+        total = self.free_space()
+        if total <= 0:
+            self.failures += 1
+            return None
+        offset = rng.random() * total
+        k = bisect_right(self.cumulative, offset, hi=len(self.starts)) - 1
+        self.spawns += 1
+        return self.starts[k] + offset - self.cumulative[k]
@@ -0,0 +1,171 @@
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from config import *
+from game_farm import play_game_args, summarize
+
+CACHE_VERSION = 1
+METRICS = ("survival_mean_s", "survival_p10_s", "score_mean", "score_p90", "boss_kill_rate")
+
+
+def number(text):
+    return int(text) if text.lstrip("-").isdigit() else float(text)
+
+
+def parse_param(text):
+    """NAME=low:high[:steps] -> (name, low, high, steps); integer bounds sweep integers"""
+    name, _, spec = text.partition("=")
+    parts = spec.split(":")
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"expected NAME=low:high[:steps], got {text}")
+    steps = int(parts[2]) if len(parts) == 3 else 3
+    return name, number(parts[0]), number(parts[1]), steps
+
+
+def round_integers(params, points):
+    """Round samples of parameters given with integer bounds"""
+    integers = [name for name, low, high, _ in params if isinstance(low + high, int)]
+    for point in points:
+        for name in integers:
+            point[name] = round(point[name])
+    return points
+
+
+def grid(params, rng, samples):
+    """Every combination of evenly spaced values"""
+    axes = []
+    for name, low, high, steps in params:
+        if steps == 1:
+            axes.append([low])
+        else:
+            axes.append([low + (high - low) * k / (steps - 1) for k in range(steps)])
+    names = [param[0] for param in params]
+    return [dict(zip(names, values)) for values in itertools.product(*axes)]
+
+
+def uniform(params, rng, samples):
+    """Independent uniform samples"""
+    return [
+        {name: rng.uniform(low, high) for name, low, high, _ in params}
+        for _ in range(samples)
+    ]
+
+
+def latin_hypercube(params, rng, samples):
+    """One sample per stratum of every parameter, strata paired at random"""
+    points = [{} for _ in range(samples)]
+    for name, low, high, _ in params:
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        for point, k in zip(points, strata):
+            point[name] = low + (high - low) * (k + rng.random()) / samples
+    return points
+
+
+SAMPLERS = {"grid": grid, "random": uniform, "lhs": latin_hypercube}
+
+
+def overrides_for(point):
+    """Config overrides for a sample; FLY_HEALTH_TIER_SCALE scales the tier scores"""
+    overrides = dict(point)
+    scale = overrides.pop("FLY_HEALTH_TIER_SCALE", None)
+    if scale is not None:
+        overrides["FLY_HEALTH_TIERS"] = [
+            [round(min_score * scale), health] for min_score, health in FLY_HEALTH_TIERS
+        ]
+    return overrides
+
+
+def cache_key(overrides, games, seed, max_ticks):
+    """Hash of everything that decides a configuration's results"""
+    blob = json.dumps([CACHE_VERSION, overrides, games, seed, max_ticks], sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def load_cache(path):
+    cache = {}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                entry = json.loads(line)
+                cache[entry["key"]] = entry["summary"]
+    return cache
+
+
+def sweep(points, games, seed, max_ticks, workers=None, cache_path=SWEEP_CACHE):
+    """Evaluate every sample over the same seeds, reusing cached results"""
+    cache = load_cache(cache_path)
+    configs = [overrides_for(point) for point in points]
+    keys = [cache_key(overrides, games, seed, max_ticks) for overrides in configs]
+    todo = {key: overrides for key, overrides in zip(keys, configs) if key not in cache}
+
+    jobs = [
+        (key, (seed + k, max_ticks, overrides))
+        for key, overrides in todo.items()
+        for k in range(games)
+    ]
+    results = {key: [] for key in todo}
+    if jobs:
+        with Pool(workers) as pool:
+            outcomes = pool.imap(play_game_args, [job for _, job in jobs], chunksize=4)
+            for (key, _), outcome in zip(jobs, outcomes):
+                results[key].append(outcome)
+
+    for key, outcomes in results.items():
+        cache[key] = summarize(outcomes)
+    if todo and cache_path:
+        with open(cache_path, "a") as f:
+            for key in results:
+                f.write(json.dumps({"key": key, "summary": cache[key]}) + "\n")
+    return [(point, cache[key]) for point, key in zip(points, keys)], len(todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep config values over headless autoplayed games")
+    parser.add_argument("params", nargs="+", type=parse_param,
+                        help="NAME=low:high[:steps], e.g. BASE_SPAWN_DELAY=0.8:2.0:4;"
+                             " FLY_HEALTH_TIER_SCALE scales the fly health tier scores")
+    parser.add_argument("--mode", choices=SAMPLERS, default="grid")
+    parser.add_argument("--samples", type=int, default=50, help="samples for random and lhs")
+    parser.add_argument("--games", type=int, default=8, help="games per configuration")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-ticks", type=int, default=18000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--cache", default=SWEEP_CACHE, help="results cache, '' to disable")
+    parser.add_argument("-o", "--output", help="write the table as CSV")
+    args = parser.parse_args()
+
+    for name, *_ in args.params:
+        if name != "FLY_HEALTH_TIER_SCALE" and not hasattr(sys.modules["config"], name):
+            parser.error(f"unknown config value {name}")
+
+    points = SAMPLERS[args.mode](args.params, random.Random(args.seed), args.samples)
+    points = round_integers(args.params, points)
+    start = time.perf_counter()
+    rows, evaluated = sweep(points, args.games, args.seed, args.max_ticks, args.workers, args.cache)
+    print(f"{len(rows)} configurations ({evaluated} played, {len(rows) - evaluated} cached)"
+          f" in {time.perf_counter() - start:.1f} s")
+
+    names = [param[0] for param in args.params]
+    header = names + list(METRICS)
+    table = [[point[name] for name in names] + [summary[m] for m in METRICS] for point, summary in rows]
+    print("  ".join(f"{column:>16}" for column in header))
+    for row in table:
+        print("  ".join(f"{value:16.3f}" for value in row))
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from config import *
+
+# Field names for the positional values of simulation events
+EVENT_FIELDS = {
+    "enemy_hit": ("id", "boss", "health"),
+    "enemy_killed": ("id", "x", "y", "boss"),
+    "player_hit": ("id", "x", "y", "boss"),
+    "enemy_escaped": ("id", "boss"),
+    "fly_spawn": ("y", "next_delay"),
+    "boss_spawned": ("health",),
+}
+SKIPPED_EVENTS = {"shoot"}
+
+
+class Telemetry:
+    def __init__(self, directory=TELEMETRY_DIR, batch_size=TELEMETRY_BATCH_SIZE,
+                 queue_size=TELEMETRY_QUEUE_SIZE, flush_interval=TELEMETRY_FLUSH_INTERVAL):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S.jsonl.gz"))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.started = time.perf_counter()
+        self.last_flush = self.started
+        self.buffer = []
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.write_errors = 0
+        self.frame_times = []
+        self.writer = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.writer.start()
+
+    def record(self, kind, tick=None, **fields):
+        """Buffer one event; never blocks"""
+        fields["type"] = kind
+        fields["t"] = round(time.perf_counter() - self.started, 4)
+        if tick is not None:
+            fields["tick"] = tick
+        self.buffer.append(fields)
+        self.recorded += 1
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def record_events(self, events, tick):
+        """Buffer this frame's simulation events"""
+        for event in events:
+            kind = event[0]
+            if kind in SKIPPED_EVENTS:
+                continue
+            self.record(kind, tick, **dict(zip(EVENT_FIELDS.get(kind, ()), event[1:])))
+
+    def frame(self, dt):
+        """Collect a frame time; a summary event is buffered once per flush interval"""
+        self.frame_times.append(dt)
+        now = time.perf_counter()
+        if now - self.last_flush < self.flush_interval:
+            return
+        times = self.frame_times
+        self.record(
+            "frames", count=len(times), mean_ms=round(sum(times) / len(times) * 1000, 3),
+            max_ms=round(max(times) * 1000, 3),
+        )
+        self.frame_times = []
+        self.flush()
+
+    def flush(self):
+        """Hand the buffered batch to the writer, dropping it if the queue is full"""
+        self.last_flush = time.perf_counter()
+        if not self.buffer:
+            return
+        try:
+            self.queue.put_nowait(self.buffer)
+        except queue.Full:
+            self.dropped += len(self.buffer)
+        self.buffer = []
+
+    def run(self):
+        """Writer thread: append each batch to the gzip stream"""
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            while True:
+                batch = self.queue.get()
+                if batch is None:
+                    return
+                try:
+                    f.write("".join(json.dumps(event) + "\n" for event in batch))
+                    f.flush()
+                    self.written += len(batch)
+                except (OSError, TypeError, ValueError):
+                    self.write_errors += 1
+
+    def stats(self):
+        """Event counters for monitoring"""
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued_batches": self.queue.qsize(),
+        }
+
+    def close(self, timeout=1.0):
+        """Flush what is buffered and stop the writer"""
+        self.flush()
+        self.queue.put(None)
+        self.writer.join(timeout)
@@ -0,0 +1,181 @@
+"""Parity of the analytic box test with ursina's intersects on recorded play.
+
+The frames in data/collision_scenarios.json hold player, bullet and enemy
+positions recorded from a seeded autoplayed game; regenerate them with
+``PYTHONPATH=. python tests/test_collision_parity.py``.
+"""
+import json
+import math
+import os
+import numpy as np
+import pytest
+from config import *
+from collision import SweepAndPrune, boxes_overlap
+
+SCENARIOS = os.path.join(os.path.dirname(__file__), "data", "collision_scenarios.json")
+# Pairs closer than this to touching are left out of the engine comparison
+TOUCH_TOLERANCE = 1e-3
+
+
+def load_frames():
+    with open(SCENARIOS) as f:
+        return json.load(f)["frames"]
+
+
+def body_pairs(frame):
+    """(kind, ax, ay, a_size, tilt, bx, by, b_size) for every body against every enemy"""
+    px, py, tilt = frame["player"]
+    bodies = [("player", px, py, PLAYER_SIZE, tilt)]
+    bodies += [("bullet", x, y, BULLET_SIZE, 0) for x, y in frame["bullets"]]
+    for kind, ax, ay, a_size, a_tilt in bodies:
+        for bx, by, b_size in frame["enemies"]:
+            yield kind, ax, ay, a_size, a_tilt, bx, by, b_size
+
+
+def gap(ax, ay, a_size, bx, by, b_size):
+    """Distance from touching along the nearer-to-separating axis"""
+    reach = (a_size + b_size) / 2
+    return min(abs(abs(ax - bx) - reach), abs(abs(ay - by) - reach))
+
+
+def tilt_is_ambiguous(ax, ay, a_size, tilt, bx, by, b_size):
+    """Whether a tilted square's exact overlap can differ from its axis-aligned box
+
+    Outside this band the answer is certain: the enemy box either reaches the
+    circle inscribed in the tilted square, or misses the square's bounding box.
+    """
+    if not tilt:
+        return False
+    dx = max(abs(ax - bx) - b_size / 2, 0)
+    dy = max(abs(ay - by) - b_size / 2, 0)
+    certain_hit = math.hypot(dx, dy) < a_size / 2
+    angle = math.radians(abs(tilt))
+    bound = a_size * (math.cos(angle) + math.sin(angle))
+    certain_miss = not boxes_overlap(ax, ay, bound, bx, by, b_size)
+    return not certain_hit and not certain_miss
+
+
+def test_scenarios_cover_contacts():
+    frames = load_frames()
+    hits = sum(
+        boxes_overlap(ax, ay, a_size, bx, by, b_size)
+        for frame in frames
+        for _, ax, ay, a_size, _, bx, by, b_size in body_pairs(frame)
+    )
+    assert len(frames) >= 100
+    assert hits >= 50
+
+
+def test_broad_phase_matches_brute_force():
+    for frame in load_frames():
+        enemies = np.array(frame["enemies"], dtype=float).reshape(-1, 3)
+        index = SweepAndPrune()
+        index.rebuild(enemies[:, 1], enemies[:, 2])
+        px, py, _ = frame["player"]
+        bodies = [(px, py, PLAYER_SIZE)] + [(x, y, BULLET_SIZE) for x, y in frame["bullets"]]
+        for x, y, size in bodies:
+            expected = {
+                i for i, (bx, by, b_size) in enumerate(enemies)
+                if boxes_overlap(x, y, size, bx, by, b_size)
+            }
+            found = {
+                i for i in index.candidates(y, size)
+                if boxes_overlap(x, y, size, *enemies[i])
+            }
+            assert found == expected
+
+
+@pytest.fixture(scope="module")
+def engine():
+    ursina = pytest.importorskip("ursina")
+    app = ursina.Ursina(window_type="offscreen")
+    yield ursina
+    app.destroy()
+
+
+def make_entity(ursina, kind, x, y, size, tilt=0):
+    # Same models and colliders the game used with intersects
+    model = "cube" if kind == "enemy" else "quad"
+    return ursina.Entity(
+        model=model, collider="box", scale=size, x=x, y=y, rotation_z=tilt
+    )
+
+
+def test_boxes_overlap_matches_intersects(engine):
+    checked = ambiguous = 0
+    mismatches = []
+    for frame in load_frames():
+        for kind, ax, ay, a_size, tilt, bx, by, b_size in body_pairs(frame):
+            if gap(ax, ay, a_size, bx, by, b_size) < TOUCH_TOLERANCE:
+                continue
+            if tilt_is_ambiguous(ax, ay, a_size, tilt, bx, by, b_size):
+                ambiguous += 1
+                continue
+            a = make_entity(engine, kind, ax, ay, a_size, tilt)
+            b = make_entity(engine, "enemy", bx, by, b_size)
+            expected = a.intersects(b).hit
+            engine.destroy(a)
+            engine.destroy(b)
+            checked += 1
+            if expected != boxes_overlap(ax, ay, a_size, bx, by, b_size):
+                mismatches.append((kind, ax, ay, tilt, bx, by, b_size, expected))
+    assert checked
+    assert not mismatches
+    # Tilt only matters in a thin band around the player's corners
+    assert ambiguous <= checked * 0.02
+
+
+def record_game(inputs, seed, frames):
+    """Up to frames / 2 frames with a contact and as many with a near miss"""
+    from simulation import Simulation
+
+    sim = Simulation(seed=seed)
+    sim.start()
+    sim.game_state.health = 10**9
+    contacts = []
+    near_misses = []
+    update_bullets = sim.update_bullets
+
+    def snapshot(dt):
+        # Positions as the step's collision checks see them
+        store = sim.enemy_spawner.enemies
+        n = store.count
+        frame = {
+            "player": [round(sim.player.x, 4), round(sim.player.y, 4), sim.player_tilt],
+            "bullets": [
+                [round(b.x + BULLET_SPEED * dt, 4), round(b.y, 4)] for b in sim.bullets
+            ],
+            "enemies": [
+                [round(float(x), 4), round(float(y), 4), float(size)]
+                for x, y, size in zip(store.x[:n], store.y[:n], store.size[:n])
+            ],
+        }
+        pairs = [pair[1:4] + pair[5:] for pair in body_pairs(frame)]
+        if any(boxes_overlap(*pair) for pair in pairs):
+            contacts.append(frame)
+        elif sim.ticks % 10 == 0 and any(gap(*pair) < 1 for pair in pairs):
+            near_misses.append(frame)
+        update_bullets(dt)
+
+    sim.update_bullets = snapshot
+    half = frames // 2
+    while (len(contacts) < half or len(near_misses) < half) and sim.ticks < 100000:
+        sim.step(sim.tick_dt, inputs(sim))
+        sim.events.clear()
+    return contacts[:half] + near_misses[:half]
+
+
+def record(path=SCENARIOS, seed=4):
+    """Bullet contacts from the autoplayer, player contacts from a weaving ship"""
+    from autoplayer import AutoPlayer
+    from simulation import Inputs
+
+    bot = AutoPlayer()
+    weave = lambda sim: Inputs(sim.ticks % 80 < 40, sim.ticks % 80 >= 40, False)
+    frames = record_game(bot.inputs, seed, 200) + record_game(weave, seed, 200)
+    with open(path, "w") as f:
+        json.dump({"seed": seed, "frames": frames}, f, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    record()
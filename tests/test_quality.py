@@ -0,0 +1,38 @@
+from config import *
+from quality import QualityGovernor
+
+# A 144 Hz display, away from the fallback rate
+BUDGET = 1 / 144
+
+
+def run(governor, ratio, frames):
+    for _ in range(frames):
+        governor.update(BUDGET * ratio)
+
+
+def test_steps_down_when_over_budget():
+    governor = QualityGovernor(budget=BUDGET)
+    run(governor, 2.0, QUALITY_WINDOW)
+    assert governor.level == 1
+    assert governor.transitions[-1][1:3] == (0, 1)
+
+
+def test_steps_up_after_consecutive_good_windows():
+    governor = QualityGovernor(budget=BUDGET)
+    governor.set_level(1)
+    run(governor, 1.0, QUALITY_WINDOW * (QUALITY_UP_WINDOWS - 1))
+    assert governor.level == 1
+    run(governor, 1.0, QUALITY_WINDOW)
+    assert governor.level == 0
+
+
+def test_marginal_window_resets_the_good_count():
+    governor = QualityGovernor(budget=BUDGET)
+    governor.set_level(1)
+    run(governor, 1.15, QUALITY_WINDOW * 4)
+    run(governor, 1.0, QUALITY_WINDOW)
+    assert governor.level == 1
+    run(governor, 1.0, QUALITY_WINDOW * (QUALITY_UP_WINDOWS - 2))
+    assert governor.level == 1
+    run(governor, 1.0, QUALITY_WINDOW)
+    assert governor.level == 0
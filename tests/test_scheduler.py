@@ -0,0 +1,58 @@
+from scheduler import Scheduler
+
+
+def test_timers_fire_in_due_order():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.schedule(2, fired.append, "b")
+    scheduler.schedule(1, fired.append, "a")
+    scheduler.update(1.5)
+    assert fired == ["a"]
+    scheduler.update(1)
+    assert fired == ["a", "b"]
+    assert scheduler.pending == 0
+
+
+def test_named_timer_replaces_pending_one():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.schedule(1, fired.append, "old", name="spawn")
+    scheduler.schedule(2, fired.append, "new", name="spawn")
+    scheduler.update(3)
+    assert fired == ["new"]
+    assert not scheduler.is_pending("spawn")
+
+
+def test_cancel_by_name():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.schedule(1, fired.append, "x", name="spawn")
+    scheduler.cancel("spawn")
+    assert not scheduler.is_pending("spawn")
+    scheduler.update(2)
+    assert fired == []
+
+
+def test_cancelled_handle_releases_its_name():
+    scheduler = Scheduler()
+    fired = []
+    timer = scheduler.schedule(1, fired.append, "x", name="spawn")
+    timer.cancel()
+    assert not scheduler.is_pending("spawn")
+    scheduler.update(2)
+    assert fired == []
+    assert "spawn" not in scheduler.named
+    assert scheduler.pending == 0
+
+
+def test_cancelled_handle_keeps_replacement_pending():
+    scheduler = Scheduler()
+    fired = []
+    old = scheduler.schedule(1, fired.append, "old", name="spawn")
+    old.cancel()
+    scheduler.schedule(3, fired.append, "new", name="spawn")
+    scheduler.update(2)
+    assert scheduler.is_pending("spawn")
+    scheduler.update(2)
+    assert fired == ["new"]
+    assert not scheduler.is_pending("spawn")
@@ -0,0 +1,28 @@
+import config
+import settings
+from simulation import Simulation
+
+
+def test_override_reaches_modules_and_restores():
+    import enemy_spawner
+
+    with settings.override({"MIN_FLY_SPEED": 1.5}):
+        assert config.MIN_FLY_SPEED == 1.5
+        assert enemy_spawner.MIN_FLY_SPEED == 1.5
+    assert enemy_spawner.MIN_FLY_SPEED == config.MIN_FLY_SPEED != 1.5
+
+
+def test_override_applies_to_spawn_lane():
+    with settings.override({"MIN_Y": -2, "MAX_Y": 2, "ENEMY_STORE_CAPACITY": 8}):
+        sim = Simulation(seed=3)
+        sim.start()
+        lane = sim.enemy_spawner.spawn_lane
+        assert (lane.low, lane.high) == (-2, 2)
+        assert len(sim.enemy_spawner.enemies.x) == 8
+        ys = []
+        for _ in range(600):
+            sim.step(sim.tick_dt)
+            store = sim.enemy_spawner.enemies
+            ys.extend(store.y[: store.count].tolist())
+    assert ys
+    assert all(-2 <= y <= 2 for y in ys)
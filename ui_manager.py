@@ -1,23 +1,32 @@
+from collections import deque
 from ursina import *
-from config import INITIAL_HEALTH
+from config import INITIAL_HEALTH, EXPLOSION_POOL_SIZE
+from asset_loader import warm_texture
+from entities import AtlasAnimation
+from hud import HudModel
+import atlas
+
+BOOM_FRAMES = ("boom1", "boom2", "boom3", "boom4")
+
+
+def warm_boom_frames():
+    if atlas.available():
+        return
+    for name in BOOM_FRAMES:
+        warm_texture(f"assets/{name}.png")
 
 
 class UIManager:
-    def __init__(self, game_state):
+    def __init__(self, game_state, asset_loader):
         self.game_state = game_state
-        
-        # Explosion animation
-        self.boom = Animation(
-            "assets/boom",
-            model="quad",
-            scale=3,
-            x=100,
-            y=100,
-            visible=False,
-            loop=False,
-            autoplay=False,
-            duration=0.2,
-        )
+        self.asset_loader = asset_loader
+
+        # Explosion animations, built on the first explosion
+        self.explosions = deque()
+        self.explosion_limit = EXPLOSION_POOL_SIZE
+        self.animation_interval = 0
+        self.animation_dt = 0
+        asset_loader.register("boom", warm_boom_frames)
 
         # Score displays
         self.score_label = Text(
@@ -50,19 +59,30 @@ class UIManager:
             z=7,
         )
 
-        # Health hearts
+        # Health hearts, built when the first game starts
         self.hearts = []
-        for i in range(INITIAL_HEALTH):
-            heart = Entity(
-                parent=camera.ui,
-                model="quad",
-                texture="assets/heart",
-                scale=0.04,
-                position=(-0.85 + (i * 0.045), 0.42),
-                enabled=False,
-                color=color.red,
-            )
-            self.hearts.append(heart)
+        self.hearts_shown = 0
+
+        # HUD values, pushed to the widgets above once per frame
+        self.hud = HudModel()
+        self.hud_texts = {
+            "score": (self.score_label, "Score: {}"),
+            "best": (self.high_score_label, "Best: {}"),
+            "boss_hp": (self.boss_health_text, "BOSS HP: {}"),
+        }
+
+        # Profiler overlay
+        self.profiler_text = Text(
+            parent=camera.ui,
+            text="",
+            position=(-0.85, 0.35),
+            origin=(-0.5, 0.5),
+            scale=0.9,
+            font="VeraMono.ttf",
+            color=color.black,
+            enabled=False,
+            z=6,
+        )
 
         # Damage flash
         self.damage_flash = Entity(
@@ -139,7 +159,6 @@ class UIManager:
             x=0.14,
             y=-0.15,
             z=1,
-            on_click=application.quit,
         )
 
         # Controls screen
@@ -165,6 +184,7 @@ class UIManager:
                 " ENTER or SPACE: Fire Bullet\n\n"
                 "GAMEPLAY:\n"
                 " P: Pause/Unpause\n"
+                " O: Frame profiler (X: save CSV)\n"
                 " Q or ESCAPE: Quit Game\n\n"
                 "Press START or SPACE/ENTER to Begin..."
             ),
@@ -186,6 +206,58 @@ class UIManager:
             z=11,
         )
 
+    def build_hearts(self):
+        """Create the health hearts"""
+        for i in range(INITIAL_HEALTH):
+            heart = Entity(
+                parent=camera.ui,
+                model="quad",
+                **atlas.texture_args("heart"),
+                scale=0.04,
+                position=(-0.85 + (i * 0.045), 0.42),
+                enabled=False,
+                color=color.red,
+            )
+            self.hearts.append(heart)
+
+    def build_explosions(self):
+        """Explosion pool, loading its frames on first use"""
+        try:
+            self.asset_loader.get("boom")
+        except:
+            pass
+        for _ in range(EXPLOSION_POOL_SIZE):
+            self.explosions.append(
+                AtlasAnimation(
+                    BOOM_FRAMES,
+                    scale=3,
+                    x=100,
+                    y=100,
+                    visible=False,
+                    loop=False,
+                    autoplay=False,
+                    duration=0.2,
+                    external_clock=True,
+                    hide_when_done=True,
+                )
+            )
+
+    def update(self, dt):
+        """Advance explosions on the game clock"""
+        self.animation_dt += dt
+        if self.animation_dt < self.animation_interval:
+            return
+        for boom in self.explosions:
+            if boom.playing:
+                boom.advance(self.animation_dt)
+        self.animation_dt = 0
+
+    def set_quality(self, settings):
+        """Limit live explosions and how often they animate"""
+        self.explosion_limit = settings["explosions"]
+        fps = settings["animation_fps"]
+        self.animation_interval = 1 / fps if fps else 0
+
     def update_hearts(self, health):
         """Show/hide hearts based on health"""
         for i, heart in enumerate(self.hearts):
@@ -194,33 +266,77 @@ class UIManager:
                 heart.enabled = True
             else:
                 heart.enabled = False
+        self.hearts_shown = max(0, min(health, len(self.hearts)))
+
+    def set_hearts(self, health):
+        """Toggle only the hearts between the shown and the new health"""
+        health = max(0, min(health, len(self.hearts)))
+        low, high = sorted((self.hearts_shown, health))
+        for i in range(low, high):
+            self.hearts[i].enabled = i < health
+        self.hearts_shown = health
+
+    def flush_hud(self):
+        """Push changed HUD values to their widgets, once per frame"""
+        rebuilds = 0
+        for name, value in self.hud.take_dirty():
+            if name == "health":
+                self.set_hearts(value)
+            elif name == "boss_visible":
+                self.boss_health_text.enabled = value
+            else:
+                widget, template = self.hud_texts[name]
+                widget.text = template.format(value)
+                rebuilds += 1
+        self.hud.count_rebuilds(rebuilds)
+
+    def show_profile(self, summary, counters=None):
+        """Write per-section frame times and counters into the overlay"""
+        lines = [f"{name:10} {ms:7.3f} ms" for name, ms in summary.items()]
+        for name, value in (counters or {}).items():
+            lines.append(f"{name:10} {value:7}")
+        self.profiler_text.text = "\n".join(lines)
 
     def flash_damage(self):
-        """Red flash + camera shake"""
+        """Red flash"""
         self.damage_flash.color = color.rgba(255, 0, 0, 120)
         self.damage_flash.animate(
             "color", color.rgba(255, 0, 0, 0), duration=0.1, curve=curve.out_quad
         )
-        camera.shake(duration=0.2, magnitude=1.5)
 
     def show_explosion(self, position):
         """Show explosion at position"""
-        self.boom.position = position
-        self.boom.visible = True
-        self.boom.start()
-        invoke(setattr, self.boom, "visible", False, delay=self.boom.duration)
+        if not self.explosions:
+            self.build_explosions()
+
+        # The front of the pool is the explosion started longest ago
+        boom = self.explosions.popleft()
+        self.explosions.append(boom)
+        if self.explosion_limit < len(self.explosions):
+            # Keep at most explosion_limit of the newest explosions playing
+            stale = self.explosions[-self.explosion_limit - 1]
+            stale.playing = False
+            stale.visible = False
+        boom.position = position
+        boom.visible = True
+        boom.start()
 
     def start_game(self, game_state):
         """Show game UI"""
+        if not self.hearts:
+            self.build_hearts()
+        self.asset_loader.prefetch("boom")
         self.gameover_screen.enabled = False
         self.controls_screen.enabled = False
         self.pause_screen.enabled = False
-        self.boss_health_text.enabled = False
         self.score_label.enabled = True
         self.high_score_label.enabled = True
-        self.high_score_label.text = f"Best: {game_state.high_score}"
-        self.score_label.text = f"Score: {game_state.score}"
         self.update_hearts(game_state.health)
+        self.hud.set("health", game_state.health)
+        self.hud.set("best", game_state.high_score)
+        self.hud.set("score", game_state.score)
+        self.hud.set("boss_visible", False)
+        self.flush_hud()
 
     def show_game_over(self, game_state):
         """Show game over screen"""
@@ -228,10 +344,9 @@ class UIManager:
         self.high_score_label.enabled = False
         self.pause_screen.enabled = False
         self.controls_screen.enabled = False
-        self.boss_health_text.enabled = False
-
-        for heart in self.hearts:
-            heart.enabled = False
+        self.hud.set("boss_visible", False)
+        self.hud.set("health", 0)
+        self.flush_hud()
 
         game_state.save_high_score()
         self.final_score_label.text = f"Score: {game_state.score}"